@@ -0,0 +1,82 @@
+import json
+import re
+import time
+from abc import ABC, abstractmethod
+from enum import Enum
+from typing import Optional
+
+from langchain_openai import ChatOpenAI
+
+from services.metrics import observe_stage
+
+class Question_Type(Enum):
+    MCQ = "MCQ"
+    TRUE_FALSE = "True_False"
+    FILL_BLANK = "Fill_Blank"
+
+class Question(ABC):
+    
+    def __init__(self, type:str):
+        self.type = Question_Type(type)
+
+    @abstractmethod
+    def generate_question(self, user_assessment : str, user_score : int, number_of_questions : int,llm : Optional[ChatOpenAI] = None):
+        pass
+
+    @abstractmethod
+    def build_chain(self, user_assessment : str, user_score : int, number_of_questions : int,llm : Optional[ChatOpenAI] = None):
+        pass
+
+    async def stream_question(self, user_assessment : str, user_score : int, number_of_questions : int,llm : Optional[ChatOpenAI] = None):
+        # Yields the answer text token by token as the LLM produces it.
+        chain, input = self.build_chain(user_assessment, user_score, number_of_questions, llm)
+        started = time.perf_counter()
+        first = True
+        async for chunk in chain.astream(input):
+            if first:
+                observe_stage("llm_first_token", time.perf_counter() - started)
+                first = False
+            yield chunk.content
+        observe_stage("llm_stream", time.perf_counter() - started)
+
+
+def parse_questions(content: str) -> list[dict]:
+    # The prompts ask for a JSON list, but models sometimes wrap it in a code
+    # fence, in {"questions": [...]} or in nested lists of question sets.
+    content = re.sub(r"^```(?:json)?\s*|\s*```$", "", content.strip())
+    parsed = json.loads(content)
+    if isinstance(parsed, dict):
+        parsed = parsed.get("questions", [parsed])
+    questions = []
+    stack = [parsed]
+    while stack:
+        item = stack.pop()
+        if isinstance(item, list):
+            stack.extend(reversed(item))
+        elif isinstance(item, dict):
+            questions.append(item)
+    return questions
+
+
+def _is_text(value) -> bool:
+    return isinstance(value, str) and bool(value.strip())
+
+
+def validate_question(question_type: Question_Type, item: dict) -> Optional[str]:
+    # Returns None for a valid question, otherwise what is wrong with it.
+    if not isinstance(item, dict) or not _is_text(item.get("question")):
+        return "question must be a non-empty string"
+    answer = item.get("answer")
+    if question_type == Question_Type.MCQ:
+        options = item.get("options")
+        if not isinstance(options, (list, dict)) or len(options) < 2:
+            return "options must list at least two choices"
+        if answer in (None, "", []):
+            return "answer is required"
+    elif question_type == Question_Type.TRUE_FALSE:
+        if not isinstance(answer, bool) and str(answer).strip().lower() not in ("true", "false"):
+            return "answer must be True or False"
+    elif question_type == Question_Type.FILL_BLANK:
+        if not (_is_text(answer) or (isinstance(answer, list) and answer and all(_is_text(str(a)) for a in answer))):
+            return "answer must list the blank answers"
+    return None
@@ -0,0 +1,59 @@
+import json
+from typing import Iterator
+
+
+class QuestionStreamParser:
+    """Incrementally pulls question objects out of a streamed JSON answer.
+
+    Feed it text as the tokens arrive; every ``{...}`` object that sits in a
+    list (or at the top level) and has a ``question`` key is returned as soon
+    as its closing brace is seen. Code fences and wrapper objects such as
+    ``{"questions": [...]}`` are skipped over.
+    """
+
+    def __init__(self):
+        self.buffer = ""
+        self.position = 0
+        self.in_string = False
+        self.escaped = False
+        # One entry per open container: its opening character and start offset.
+        self.stack: list[tuple[str, int]] = []
+
+    def feed(self, text: str) -> Iterator[dict]:
+        self.buffer += text
+        while self.position < len(self.buffer):
+            char = self.buffer[self.position]
+            if self.in_string:
+                if self.escaped:
+                    self.escaped = False
+                elif char == "\\":
+                    self.escaped = True
+                elif char == '"':
+                    self.in_string = False
+            elif char == '"':
+                self.in_string = bool(self.stack)
+            elif char in "{[":
+                self.stack.append((char, self.position))
+            elif char in "}]" and self.stack:
+                opening, start = self.stack.pop()
+                parent = self.stack[-1][0] if self.stack else None
+                if opening == "{" and char == "}" and parent != "{":
+                    item = self._load(self.buffer[start:self.position + 1])
+                    if isinstance(item, dict) and "question" in item:
+                        yield item
+            self.position += 1
+        self._trim()
+
+    def _load(self, text: str):
+        try:
+            return json.loads(text)
+        except ValueError:
+            return None
+
+    def _trim(self):
+        # Drop text no open container can refer to any more.
+        start = self.stack[0][1] if self.stack else self.position
+        if start:
+            self.buffer = self.buffer[start:]
+            self.position -= start
+            self.stack = [(opening, offset - start) for opening, offset in self.stack]
@@ -0,0 +1,414 @@
+
+from enum import Enum
+import bisect
+import hashlib
+import math
+import os
+import threading
+import time
+from concurrent.futures import Executor
+from itertools import accumulate, repeat
+from typing import Callable, Iterable, Iterator, Optional, Union
+from langchain.text_splitter import RecursiveCharacterTextSplitter
+from langchain.text_splitter import SentenceTransformersTokenTextSplitter
+from langchain.text_splitter import CharacterTextSplitter
+from PyPDF2 import PdfReader
+from langchain_openai import OpenAIEmbeddings
+from langchain_google_genai import GoogleGenerativeAIEmbeddings
+from langchain_community.vectorstores import FAISS
+from langchain_community.document_loaders import AssemblyAIAudioTranscriptLoader
+from langchain_community.document_loaders.assemblyai import TranscriptFormat
+from langchain.chains import RetrievalQA
+from langchain_openai import OpenAI
+
+from dotenv import load_dotenv
+
+from services.metrics import observe_stage, timed
+
+load_dotenv()
+
+class Chunker:
+    def __init__(self, chunk_size: int = 1000, chunk_overlap: int = 200):
+        self.chunk_size = chunk_size
+        self.chunk_overlap = chunk_overlap
+        self.text_splitter = None
+        
+    
+    def RecursiveCharacterTextSplitter(self):
+        self.text_splitter = RecursiveCharacterTextSplitter(chunk_size=self.chunk_size, chunk_overlap=self.chunk_overlap)
+        return self
+
+    def SentenceTransformersChunker(self):
+        self.text_splitter = SentenceTransformersTokenTextSplitter(chunk_size=self.chunk_size, chunk_overlap=self.chunk_overlap)
+        return self
+
+    def CharacterTextSplitter(self):
+        self.text_splitter = CharacterTextSplitter(chunk_size=self.chunk_size, chunk_overlap=self.chunk_overlap)
+        return self
+
+    def chunk_text(self, text: str):
+        return self.text_splitter.split_text(text)
+
+    def chunk_stream(self, texts: Iterable[str]) -> Iterator[str]:
+        # Split page by page instead of on the whole document. The last chunk of
+        # every split is carried into the next page so chunks can still span pages.
+        buffer = ""
+        for text in texts:
+            buffer += text
+            if len(buffer) < 4 * self.chunk_size:
+                continue
+            chunks = self.text_splitter.split_text(buffer)
+            if len(chunks) < 2:
+                continue
+            yield from chunks[:-1]
+            buffer = chunks[-1]
+        if buffer.strip():
+            yield from self.text_splitter.split_text(buffer)
+
+    
+
+class FileType(Enum):
+    PDF = "pdf"
+    DOCX = "docx"
+    TXT = "txt"
+    CSV = "csv"
+    EXCEL = "excel"
+    JSON = "json"
+    AUDIO = "audio"
+
+
+def _extract_pdf_pages(pdf_path: str, start: int, stop: Optional[int]) -> list[str]:
+    # Module level so it can be pickled into a ProcessPoolExecutor.
+    with open(pdf_path, "rb") as file:
+        pdf_reader = PdfReader(file)
+        return [page.extract_text() or "" for page in pdf_reader.pages[start:stop]]
+
+
+def locate_pages(chunks: list[str], pages: list[str]) -> list[Optional[int]]:
+    # 1-based page on which each chunk starts. Chunks are substrings of the
+    # concatenated pages, in order, so each search starts at the previous hit.
+    text = "".join(pages)
+    starts = list(accumulate(len(page) for page in pages[:-1]))
+    located = []
+    cursor = 0
+    for chunk in chunks:
+        found = text.find(chunk, cursor)
+        if found == -1:
+            located.append(None)
+            continue
+        cursor = found + 1
+        located.append(bisect.bisect_right(starts, found) + 1)
+    return located
+
+
+class GetText:
+    def __init__(self, file : Optional[str] = None, file_type : Optional[FileType] = None):
+        self.file = file
+        self.text = ""
+        self.type = file_type
+        
+    def get_text(self):
+        return self.text
+    
+    def get_text_from_file(self):   
+        
+        if self.type == FileType.PDF:
+            self.text = self.get_text_from_pdf(self.file)
+        elif self.type == FileType.DOCX:
+            self.text = self.get_text_from_docx(self.file)
+        elif self.type == FileType.TXT:
+            self.text = self.get_text_from_txt(self.file)
+        elif self.type == FileType.AUDIO:
+            self.text = self.get_text_from_audio(self.file)
+            
+
+        return self.text
+
+    def count_pages(self) -> int:
+        if self.type == FileType.PDF:
+            with open(self.file, "rb") as file:
+                return len(PdfReader(file).pages)
+        return 1
+
+    def iter_text_from_file(self, executor: Optional[Executor] = None) -> Iterator[str]:
+        if self.type == FileType.PDF:
+            yield from self.iter_text_from_pdf(self.file, executor)
+        else:
+            yield self.get_text_from_file()
+
+    def get_text_from_audio(self, audio_path: str):
+        with open(audio_path, "rb") as file:
+            audio_reader = AssemblyAIAudioTranscriptLoader(file, transcript_format=TranscriptFormat.TEXT)
+            text = audio_reader.load()
+        return text
+
+    def get_text_from_pdf(self, pdf_path: str):
+        return "".join(self.iter_text_from_pdf(pdf_path))
+
+    def iter_text_from_pdf(self, pdf_path: str, executor: Optional[Executor] = None, pages_per_task: int = 8) -> Iterator[str]:
+        # Yields page texts in order. With an executor (normally a process pool)
+        # the pages are extracted in parallel, pages_per_task pages per worker call.
+        if executor is None:
+            yield from _extract_pdf_pages(pdf_path, 0, None)
+            return
+        with open(pdf_path, "rb") as file:
+            page_count = len(PdfReader(file).pages)
+        starts = range(0, page_count, pages_per_task)
+        stops = [min(start + pages_per_task, page_count) for start in starts]
+        for pages in executor.map(_extract_pdf_pages, repeat(pdf_path), starts, stops):
+            yield from pages
+
+    def get_text_from_docx(self, docx_path: str):
+        #doc = docx.Document(docx_path)  
+        text = ""
+        # for paragraph in doc.paragraphs:
+        #     text += paragraph.text
+        return text
+    
+    def get_text_from_txt(self, txt_path: str): 
+        with open(txt_path, "r") as file:
+            text = file.read()
+        return text
+    
+    def get_text_from_csv(self, csv_path: str):
+        with open(csv_path, "r") as file:
+            text = file.read()
+        return text
+    
+    def get_text_from_excel(self, excel_path: str):
+        with open(excel_path, "r") as file:
+            text = file.read()
+        return text
+    
+    def get_text_from_json(self, json_path: str):
+        with open(json_path, "r") as file:
+            text = file.read()
+        return text
+    
+import getpass
+from langchain_core.embeddings import Embeddings
+from RAG.embedding_cache import CachedEmbeddings
+
+OPENAI_EMBEDDING_MODEL = "text-embedding-3-large"
+
+
+class HashEmbeddings(Embeddings):
+    # Deterministic, offline embeddings (hashed bag of words). Used by the
+    # benchmarks and for local runs without an API key.
+    def __init__(self, dimension: int = 256):
+        self.dimension = dimension
+
+    def _embed(self, text: str) -> list[float]:
+        vector = [0.0] * self.dimension
+        for token in text.lower().split():
+            digest = int.from_bytes(hashlib.blake2b(token.encode(), digest_size=8).digest(), "little")
+            vector[digest % self.dimension] += 1.0 if digest & (1 << 63) else -1.0
+        norm = math.sqrt(sum(value * value for value in vector)) or 1.0
+        return [value / norm for value in vector]
+
+    def embed_documents(self, texts: list[str]) -> list[list[float]]:
+        return [self._embed(text) for text in texts]
+
+    def embed_query(self, text: str) -> list[float]:
+        return self._embed(text)
+
+
+class Embedder:
+    def __init__(self):
+        pass
+
+    def GoogleEmbedder(self):
+
+        embedder = GoogleGenerativeAIEmbeddings(model_name="models/text-embedding-004", google_api_key=os.environ["GOOGLE_API_KEY"])
+        return embedder
+
+    def OpenAIEmbedder(self):
+        embedder = OpenAIEmbeddings(model=OPENAI_EMBEDDING_MODEL, api_key=os.environ["OPENAI_API_KEY"])
+        return embedder
+
+    def LocalEmbedder(self, dimension: int = 256):
+        return HashEmbeddings(dimension)
+
+    def CachedEmbedder(self, embeddings: Embeddings, model: str, batch_size: Optional[int] = None):
+        # model is part of the cache key, it must change whenever the vectors would.
+        return CachedEmbeddings(embeddings, model, batch_size)
+
+from langchain_community.vectorstores import FAISS
+from langchain_community.docstore.in_memory import InMemoryDocstore
+from langchain.docstore.document import Document
+import faiss
+import numpy as np
+from RAG.ann import IndexType, build_index
+from RAG.registry import DEFAULT_DOC_ID, IndexRegistry, index_registry
+class VectorStore:
+    def __init__(self):
+        pass
+    
+    def FAISSVectorStore(self, texts: list[str], embeddings: Embedder, save_path: Optional[str] = None,
+                         index_type: Optional[IndexType] = None, metadatas: Optional[list[dict]] = None):
+        
+        # Embed everything in one call and take the dimension from the result.
+        # Identical chunks are stored once, under an id derived from their content,
+        # with the metadata of their first occurrence.
+        unique = {}
+        for text, metadata in zip(texts, metadatas or [{}] * len(texts)):
+            unique.setdefault(text, metadata)
+        texts = list(unique)
+        with timed("embed"):
+            vectors = embeddings.embed_documents(texts)
+        with timed("faiss_build"):
+            faiss_index = build_index(np.asarray(vectors, dtype=np.float32), index_type)
+            vector_store = FAISS(embeddings, faiss_index, InMemoryDocstore(), {})
+            ids = [hashlib.sha256(text.encode("utf-8")).hexdigest() for text in texts]
+            vector_store.add_embeddings(zip(texts, vectors), metadatas=list(unique.values()), ids=ids)
+        if save_path:
+            with timed("faiss_save"):
+                vector_store.save_local(save_path)
+        return vector_store
+    
+    def ChromaVectorStore(self, texts: list[str], embeddings: Embedder):
+        # Can Be built down the line
+        """vector_store = Chroma.from_texts(texts, embedding=embeddings)
+        return vector_store"""
+        pass
+    
+    def PineconeVectorStore(self, texts: list[str], embeddings: Embedder):
+        # Can Be built down the line
+        """vector_store = Pinecone.from_texts(texts, embedding=embeddings)
+        return vector_store"""
+        pass
+    
+    def MilvusVectorStore(self, texts: list[str], embeddings: Embedder):
+        # Can Be built down the line
+        """ vector_store = Milvus.from_texts(texts, embedding=embeddings)
+        return vector_store"""
+        pass
+
+_shared_embeddings: Optional[Embeddings] = None
+_shared_embeddings_lock = threading.Lock()
+
+
+def shared_embeddings(create: bool = True) -> Optional[Embeddings]:
+    # The process-wide cached OpenAI embeddings. Opening the cache reads its
+    # index from disk, so this is first called from worker threads, not the event loop.
+    global _shared_embeddings
+    with _shared_embeddings_lock:
+        if _shared_embeddings is None and create:
+            if not os.getenv("OPENAI_API_KEY"):
+                raise RuntimeError("OPENAI_API_KEY is not set")
+            embedder = Embedder()
+            _shared_embeddings = embedder.CachedEmbedder(embedder.OpenAIEmbedder(), OPENAI_EMBEDDING_MODEL)
+        return _shared_embeddings
+
+
+class RAG:
+    def __init__(self, embeddings: Optional[Embeddings] = None, registry: Optional[IndexRegistry] = None):
+        self.file_path = None
+        self.embeddings = embeddings
+        self.registry = registry or index_registry
+
+    def get_embeddings(self):
+        # Built once per process instead of once per query.
+        if self.embeddings is None:
+            self.embeddings = shared_embeddings()
+        return self.embeddings
+
+    def get_query_embeddings(self):
+        # Queries skip the chunk cache: they rarely repeat and would grow it for good.
+        embeddings = self.get_embeddings()
+        return embeddings.embeddings if isinstance(embeddings, CachedEmbeddings) else embeddings
+
+    def set_file_path(self, file_path: str):
+        end = file_path.split(".")[-1].lower()
+        if end in ["wav", "mp3", "mp4", "m4a"]:
+            self.type = FileType.AUDIO
+        else:
+            for file_type in FileType:
+                if end == file_type.value:
+                    self.type = file_type
+                    break
+            else:
+                raise ValueError("Invalid file type: " + file_path)
+        if not os.path.isfile(file_path):
+            raise ValueError("File not found: " + file_path)
+        self.file_path = file_path
+        
+    def ingest(self, doc_id: str = DEFAULT_DOC_ID, executor: Optional[Executor] = None,
+               progress: Optional[Callable[[str, int, int], None]] = None):
+        # progress is called as progress(stage, done, total)
+        report = progress or (lambda stage, done, total: None)
+        get_text = GetText(self.file_path, self.type)
+        page_count = get_text.count_pages()
+        extract_seconds = 0.0
+        page_texts = []
+
+        def pages():
+            # Extraction and chunking are interleaved, so the time spent waiting
+            # for pages is summed here and the rest is attributed to chunking.
+            nonlocal extract_seconds
+            texts = iter(get_text.iter_text_from_file(executor))
+            done = 0
+            while True:
+                started = time.perf_counter()
+                page = next(texts, None)
+                extract_seconds += time.perf_counter() - started
+                if page is None:
+                    return
+                done += 1
+                report("extracting", done, page_count)
+                page_texts.append(page)
+                yield page
+
+        started = time.perf_counter()
+        chunks = list(Chunker().RecursiveCharacterTextSplitter().chunk_stream(pages()))
+        observe_stage("extract", extract_seconds)
+        observe_stage("chunk", time.perf_counter() - started - extract_seconds)
+        if not chunks:
+            raise ValueError("No text could be extracted from " + self.file_path)
+        metadatas = [{"doc_id": doc_id, "chunk": position} for position in range(len(chunks))]
+        if self.type == FileType.PDF:
+            for metadata, page in zip(metadatas, locate_pages(chunks, page_texts)):
+                if page is not None:
+                    metadata["page"] = page
+        report("embedding", 0, len(chunks))
+        vector_store = VectorStore().FAISSVectorStore(chunks, self.get_embeddings(), metadatas=metadatas)
+        report("saving", len(chunks), len(chunks))
+        self.registry.save(doc_id, vector_store)
+        return vector_store
+
+    
+    def get_relevalant_chunks(self,query: str, doc_id: str = DEFAULT_DOC_ID):
+        db = self.registry.get(doc_id, self.get_embeddings())
+        #vector_store = VectorStore().FAISSVectorStore(len([query]), embeddings)
+        with timed("embed_query"):
+            vector = self.get_query_embeddings().embed_query(query)
+        with timed("faiss_search"):
+            retrived_content = db.similarity_search_by_vector(vector)
+        #chain = RetrievalQA.from_chain_type(llm=OpenAI(model="gpt-3.5-turbo"), chain_type="stuff", retriever=db.as_retriever())
+        #response = chain({"input_documents": retrived_content, "query": query}, return_only_outputs=True)
+        #doc = response["output_text"]
+        return retrived_content[0].page_content
+
+    def get_relevant_chunks_batch(self, queries: list[str], k: int = 4, doc_id: str = DEFAULT_DOC_ID):
+        # One embedding call and one matrix search for all queries.
+        db = self.registry.get(doc_id, self.get_embeddings())
+        k = min(k, db.index.ntotal)
+        if k < 1:
+            return [[] for _ in queries]
+        with timed("embed_query"):
+            vectors = np.asarray(self.get_query_embeddings().embed_documents(queries), dtype=np.float32)
+        with timed("faiss_search"):
+            distances, positions = db.index.search(vectors, k)
+        results = []
+        for row_distances, row_positions in zip(distances, positions):
+            hits = []
+            for distance, position in zip(row_distances, row_positions):
+                if position == -1:
+                    continue
+                chunk_id = db.index_to_docstore_id[position]
+                doc = db.docstore.search(chunk_id)
+                hits.append({"id": chunk_id, "content": doc.page_content, "distance": float(distance), "metadata": doc.metadata})
+            results.append(hits)
+        return results
+
+    
@@ -0,0 +1,51 @@
+import math
+import os
+from enum import Enum
+from typing import Optional
+
+import faiss
+import numpy as np
+from dotenv import load_dotenv
+
+load_dotenv()
+
+
+class IndexType(Enum):
+    FLAT = "flat"
+    IVF = "ivf"
+    HNSW = "hnsw"
+
+
+def default_index_type() -> IndexType:
+    return IndexType(os.getenv("FAISS_INDEX_TYPE", IndexType.FLAT.value))
+
+
+def build_index(vectors: np.ndarray, index_type: Optional[IndexType] = None, nlist: Optional[int] = None,
+                hnsw_m: Optional[int] = None) -> faiss.Index:
+    # Returns an empty, trained index for vectors of this shape; the caller adds them.
+    index_type = index_type or default_index_type()
+    count, dimension = vectors.shape
+    if index_type == IndexType.IVF:
+        nlist = nlist or int(os.getenv("FAISS_IVF_NLIST", "0")) or int(math.sqrt(count))
+        # IVF needs a few dozen training points per list, small corpora stay flat.
+        if count >= 39 * nlist and nlist > 1:
+            quantizer = faiss.IndexFlatL2(dimension)
+            index = faiss.IndexIVFFlat(quantizer, dimension, nlist)
+            index.train(np.ascontiguousarray(vectors, dtype=np.float32))
+            set_search_params(index)
+            return index
+    elif index_type == IndexType.HNSW:
+        index = faiss.IndexHNSWFlat(dimension, hnsw_m or int(os.getenv("FAISS_HNSW_M", "32")))
+        index.hnsw.efConstruction = int(os.getenv("FAISS_HNSW_EF_CONSTRUCTION", "80"))
+        set_search_params(index)
+        return index
+    return faiss.IndexFlatL2(dimension)
+
+
+def set_search_params(index: faiss.Index, nprobe: Optional[int] = None, ef_search: Optional[int] = None):
+    # Search-time knobs are not always restored by read_index, so set them after loading too.
+    ivf = faiss.try_extract_index_ivf(index)
+    if ivf is not None:
+        ivf.nprobe = nprobe or int(os.getenv("FAISS_NPROBE", "8"))
+    elif isinstance(index, faiss.IndexHNSW):
+        index.hnsw.efSearch = ef_search or int(os.getenv("FAISS_HNSW_EF_SEARCH", "64"))
@@ -0,0 +1,168 @@
+import hashlib
+import json
+import os
+import re
+import threading
+from typing import Optional
+
+import numpy as np
+from dotenv import load_dotenv
+from langchain_core.embeddings import Embeddings
+
+from services.metrics import timed
+
+load_dotenv()
+
+VECTORS_FILE = "vectors.f32"
+INDEX_FILE = "index.jsonl"
+
+
+def embedding_key(model: str, text: str) -> str:
+    return hashlib.sha256((model + "\0" + text).encode("utf-8")).hexdigest()
+
+
+class EmbeddingCache:
+    """Persistent embedding store for one model.
+
+    Vectors are appended as raw float32 rows to ``vectors.f32`` and
+    ``index.jsonl`` maps each content key to its row. Index lines are only
+    written after their rows, so a crash can leave unused rows but never an
+    entry pointing at missing data. The vectors file is memory-mapped, so
+    opening a large cache or appending to it does not copy it into memory.
+    """
+
+    def __init__(self, model: str, root: Optional[str] = None):
+        self.model = model
+        self.root = root or os.getenv("EMBEDDING_CACHE_DIR", "embedding_cache")
+        self.path = os.path.join(self.root, re.sub(r"[^A-Za-z0-9_.-]", "_", model))
+        self.rows: dict[str, int] = {}
+        self.dimension = None
+        self._vectors = None
+        self._lock = threading.Lock()
+        self._load()
+
+    def _load(self):
+        index_path = os.path.join(self.path, INDEX_FILE)
+        vectors_path = os.path.join(self.path, VECTORS_FILE)
+        if not os.path.exists(index_path):
+            return
+        rows = {}
+        dimension = None
+        with open(index_path) as file:
+            for line in file:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    continue
+                rows[entry["key"]] = entry["row"]
+                dimension = entry["dim"]
+        if dimension is None:
+            return
+        self.dimension = dimension
+        self._map(vectors_path)
+        self.rows = {key: row for key, row in rows.items() if row < len(self._vectors)}
+        if len(self.rows) < len(rows):
+            # The vectors file is missing or shorter than the index says. Rewrite
+            # the index without those entries so new rows can't be matched to them.
+            self._rewrite_index(index_path)
+
+    def _rewrite_index(self, index_path: str):
+        with open(index_path + ".tmp", "w") as file:
+            for key, row in sorted(self.rows.items(), key=lambda item: item[1]):
+                file.write(json.dumps({"key": key, "row": row, "dim": self.dimension}) + "\n")
+        os.replace(index_path + ".tmp", index_path)
+
+    def _map(self, vectors_path: str):
+        # Ignores a partly written last row; remapped after every append. A
+        # missing or short file counts as zero rows.
+        count = os.path.getsize(vectors_path) // (4 * self.dimension) if os.path.exists(vectors_path) else 0
+        if count:
+            self._vectors = np.memmap(vectors_path, dtype=np.float32, mode="r", shape=(count, self.dimension))
+        else:
+            self._vectors = np.zeros((0, self.dimension), dtype=np.float32)
+
+    def __len__(self):
+        return len(self.rows)
+
+    def get_many(self, keys: list[str]) -> dict[str, np.ndarray]:
+        with self._lock:
+            found = [key for key in keys if key in self.rows]
+            if not found:
+                return {}
+            vectors = np.asarray(self._vectors[[self.rows[key] for key in found]])
+        return dict(zip(found, vectors))
+
+    def put_many(self, items: dict[str, list[float]]):
+        with self._lock:
+            items = {key: vector for key, vector in items.items() if key not in self.rows}
+            if not items:
+                return
+            vectors = np.asarray(list(items.values()), dtype=np.float32)
+            if self.dimension is None:
+                self.dimension = vectors.shape[1]
+            if vectors.shape[1] != self.dimension:
+                raise ValueError("Embedding dimension changed for model " + self.model)
+            os.makedirs(self.path, exist_ok=True)
+            vectors_path = os.path.join(self.path, VECTORS_FILE)
+            with open(vectors_path, "ab") as file:
+                first_row = file.tell() // (4 * self.dimension)
+                # Drop a partial row from an interrupted write so new rows stay aligned.
+                file.truncate(first_row * 4 * self.dimension)
+                file.write(vectors.tobytes())
+            with open(os.path.join(self.path, INDEX_FILE), "a") as file:
+                for offset, key in enumerate(items):
+                    self.rows[key] = first_row + offset
+                    file.write(json.dumps({"key": key, "row": first_row + offset, "dim": self.dimension}) + "\n")
+            self._map(vectors_path)
+
+
+class CachedEmbeddings(Embeddings):
+    """Wraps an embeddings client with an EmbeddingCache.
+
+    Texts are deduplicated, looked up by hash(model, text) and only the
+    misses are sent to the provider, ``batch_size`` texts per request.
+    """
+
+    def __init__(self, embeddings: Embeddings, model: str, batch_size: Optional[int] = None,
+                 cache: Optional[EmbeddingCache] = None):
+        self.embeddings = embeddings
+        self.model = model
+        self.batch_size = batch_size or int(os.getenv("EMBEDDING_BATCH_SIZE", "256"))
+        self.cache = cache if cache is not None else EmbeddingCache(model)
+        self.hits = 0
+        self.misses = 0
+        self.provider_calls = 0
+
+    def embed_documents(self, texts: list[str]) -> list[list[float]]:
+        keys = [embedding_key(self.model, text) for text in texts]
+        unique = dict(zip(keys, texts))
+        found = self.cache.get_many(list(unique))
+        missing = [(key, text) for key, text in unique.items() if key not in found]
+        self.hits += len(texts) - len(missing)
+        self.misses += len(missing)
+
+        for start in range(0, len(missing), self.batch_size):
+            batch = missing[start:start + self.batch_size]
+            with timed("embed_provider"):
+                vectors = self.embeddings.embed_documents([text for _, text in batch])
+            self.provider_calls += 1
+            new = {key: vector for (key, _), vector in zip(batch, vectors)}
+            self.cache.put_many(new)
+            found.update({key: np.asarray(vector, dtype=np.float32) for key, vector in new.items()})
+
+        return [found[key].tolist() for key in keys]
+
+    def embed_query(self, text: str) -> list[float]:
+        # Queries rarely repeat; caching them would only grow the cache.
+        return self.embeddings.embed_query(text)
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            "model": self.model,
+            "entries": len(self.cache),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "provider_calls": self.provider_calls,
+        }
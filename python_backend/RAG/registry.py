@@ -0,0 +1,200 @@
+import os
+import pickle
+import re
+import shutil
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from typing import Optional
+
+import faiss
+from dotenv import load_dotenv
+from langchain_community.vectorstores import FAISS
+from langchain_core.embeddings import Embeddings
+
+from RAG.ann import set_search_params
+from services.metrics import timed
+
+load_dotenv()
+
+DEFAULT_DOC_ID = "uploaded_pdf"
+# Where the single index was saved before the registry existed.
+LEGACY_INDEX_DIR = "uploaded_pdf_faiss_index"
+CURRENT_FILE = "CURRENT"
+_DOC_ID = re.compile(r"^[A-Za-z0-9_.-]{1,128}$")
+
+
+def index_bytes(vector_store: FAISS) -> int:
+    # Rough resident size: raw vectors plus the chunk texts in the docstore.
+    index = vector_store.index
+    text_bytes = sum(len(doc.page_content) for doc in vector_store.docstore._dict.values())
+    return index.ntotal * index.d * 4 + text_bytes
+
+
+class IndexRegistry:
+    """Keeps FAISS indexes in memory, keyed by document or collection id.
+
+    Indexes are loaded from ``root/<doc_id>`` on first use and evicted least
+    recently used first once ``max_indexes`` or ``max_bytes`` is exceeded.
+    Every save writes a new version directory and then atomically swaps the
+    ``CURRENT`` pointer, so readers never see a half written index.
+    """
+
+    def __init__(self, root: Optional[str] = None, max_bytes: Optional[int] = None,
+                 max_indexes: Optional[int] = None, mmap: Optional[bool] = None,
+                 legacy_path: Optional[str] = None):
+        self.root = root or os.getenv("FAISS_INDEX_DIR", "faiss_indexes")
+        self.legacy_path = legacy_path or os.getenv("FAISS_LEGACY_INDEX_DIR", LEGACY_INDEX_DIR)
+        self.max_bytes = max_bytes or int(os.getenv("FAISS_CACHE_MAX_BYTES", str(512 * 1024 * 1024)))
+        self.max_indexes = max_indexes or int(os.getenv("FAISS_CACHE_MAX_INDEXES", "32"))
+        self.mmap = mmap if mmap is not None else os.getenv("FAISS_MMAP", "0") == "1"
+        self._indexes: OrderedDict[str, tuple[str, FAISS, int]] = OrderedDict()
+        self._lock = threading.Lock()
+        self._load_locks: dict[str, threading.Lock] = {}
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def _check_id(self, doc_id: str):
+        if not _DOC_ID.match(doc_id):
+            raise ValueError("Invalid document id: " + doc_id)
+
+    def doc_path(self, doc_id: str) -> str:
+        self._check_id(doc_id)
+        return os.path.join(self.root, doc_id)
+
+    def current_version(self, doc_id: str) -> Optional[str]:
+        try:
+            with open(os.path.join(self.doc_path(doc_id), CURRENT_FILE)) as file:
+                return file.read().strip()
+        except FileNotFoundError:
+            if doc_id == DEFAULT_DOC_ID:
+                return self._migrate_legacy()
+            return None
+
+    def _migrate_legacy(self) -> Optional[str]:
+        # Copies an index saved by the pre-registry code into DEFAULT_DOC_ID,
+        # once. The old directory is left in place.
+        if not os.path.isfile(os.path.join(self.legacy_path, "index.faiss")):
+            return None
+        with self._lock:
+            try:
+                with open(os.path.join(self.doc_path(DEFAULT_DOC_ID), CURRENT_FILE)) as file:
+                    return file.read().strip()
+            except FileNotFoundError:
+                pass
+            version = self._new_version()
+            shutil.copytree(self.legacy_path, os.path.join(self.doc_path(DEFAULT_DOC_ID), version))
+            self._publish(DEFAULT_DOC_ID, version)
+            return version
+
+    def ids(self) -> list[str]:
+        self.current_version(DEFAULT_DOC_ID)
+        if not os.path.isdir(self.root):
+            return []
+        # Skip anything in the directory that isn't a valid id, e.g. stray files.
+        return sorted(doc_id for doc_id in os.listdir(self.root)
+                      if _DOC_ID.match(doc_id) and os.path.isdir(os.path.join(self.root, doc_id))
+                      and self.current_version(doc_id))
+
+    def get(self, doc_id: str, embeddings: Embeddings) -> FAISS:
+        version = self.current_version(doc_id)
+        if version is None:
+            raise KeyError("No index for document: " + doc_id)
+        with self._lock:
+            entry = self._indexes.get(doc_id)
+            if entry is not None and entry[0] == version:
+                self._indexes.move_to_end(doc_id)
+                self.hits += 1
+                return entry[1]
+            load_lock = self._load_locks.setdefault(doc_id, threading.Lock())
+
+        # Load outside the registry lock so other documents stay servable,
+        # but only once per document.
+        with load_lock:
+            with self._lock:
+                entry = self._indexes.get(doc_id)
+                if entry is not None and entry[0] == version:
+                    self._indexes.move_to_end(doc_id)
+                    self.hits += 1
+                    return entry[1]
+                self.misses += 1
+            vector_store = self._load(os.path.join(self.doc_path(doc_id), version), embeddings)
+            self._put(doc_id, version, vector_store)
+            return vector_store
+
+    def _load(self, path: str, embeddings: Embeddings) -> FAISS:
+        with timed("faiss_load"):
+            return self._read(path, embeddings)
+
+    def _read(self, path: str, embeddings: Embeddings) -> FAISS:
+        if not self.mmap:
+            vector_store = FAISS.load_local(path, embeddings, allow_dangerous_deserialization=True)
+        else:
+            index = faiss.read_index(os.path.join(path, "index.faiss"), faiss.IO_FLAG_MMAP | faiss.IO_FLAG_READ_ONLY)
+            with open(os.path.join(path, "index.pkl"), "rb") as file:
+                docstore, index_to_docstore_id = pickle.load(file)
+            vector_store = FAISS(embeddings, index, docstore, index_to_docstore_id)
+        set_search_params(vector_store.index)
+        return vector_store
+
+    def _put(self, doc_id: str, version: str, vector_store: FAISS):
+        with self._lock:
+            self._indexes[doc_id] = (version, vector_store, index_bytes(vector_store))
+            self._indexes.move_to_end(doc_id)
+            self._evict()
+
+    def _evict(self):
+        # Always keep the most recently used index, even if it alone is over budget.
+        while len(self._indexes) > 1 and (
+            len(self._indexes) > self.max_indexes or self.resident_bytes() > self.max_bytes
+        ):
+            self._indexes.popitem(last=False)
+            self.evictions += 1
+
+    def resident_bytes(self) -> int:
+        return sum(entry[2] for entry in self._indexes.values())
+
+    def save(self, doc_id: str, vector_store: FAISS):
+        doc_path = self.doc_path(doc_id)
+        os.makedirs(doc_path, exist_ok=True)
+        version = self._new_version()
+        with timed("faiss_save"):
+            vector_store.save_local(os.path.join(doc_path, version))
+
+        self._publish(doc_id, version)
+        self._put(doc_id, version, vector_store)
+
+        # Keep the previous version around for readers that resolved CURRENT
+        # just before the swap.
+        versions = sorted(name for name in os.listdir(doc_path) if name.startswith("v-"))
+        for name in versions[:-2]:
+            shutil.rmtree(os.path.join(doc_path, name), ignore_errors=True)
+
+    def _new_version(self) -> str:
+        return "v-%d-%s" % (time.time_ns(), uuid.uuid4().hex[:8])
+
+    def _publish(self, doc_id: str, version: str):
+        pointer = os.path.join(self.doc_path(doc_id), CURRENT_FILE + "." + version)
+        with open(pointer, "w") as file:
+            file.write(version)
+        os.replace(pointer, os.path.join(self.doc_path(doc_id), CURRENT_FILE))
+
+    def invalidate(self, doc_id: str):
+        with self._lock:
+            self._indexes.pop(doc_id, None)
+
+    def stats(self):
+        with self._lock:
+            return {
+                "indexes": list(self._indexes.keys()),
+                "resident_bytes": self.resident_bytes(),
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+            }
+
+
+index_registry = IndexRegistry()
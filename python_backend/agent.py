@@ -0,0 +1,212 @@
+
+
+
+
+import asyncio
+import os
+from typing import Dict, Optional
+from langchain_core.language_models import BaseChatModel
+from langchain_core.prompts import ChatPromptTemplate
+import Questions
+from Questions.Question import Question, Question_Type, parse_questions, validate_question
+from Questions.stream import QuestionStreamParser
+from Questions.MCQ import MCQ
+from Questions.True_False import True_False
+from Questions.Fill_Blank import Fill_Blank
+from services.llm_pool import LLMExecutor, get_llm, llm_executor
+from services.metrics import timed
+from services.question_cache import ResultCache, normalize_assessment, score_bucket
+from dotenv import load_dotenv
+
+load_dotenv()
+
+QUESTION_CLASSES = {
+    "MCQ": (MCQ, Question_Type.MCQ),
+    "TRUE_FALSE": (True_False, Question_Type.TRUE_FALSE),
+    "FILL_BLANK": (Fill_Blank, Question_Type.FILL_BLANK),
+}
+
+
+def split_count(total: int, chunk_size: int) -> list[int]:
+    # 12 questions in chunks of 5 -> [5, 5, 2]
+    return [min(chunk_size, total - start) for start in range(0, total, chunk_size)]
+
+
+class Agent:
+    def __init__(self, llm: Optional[BaseChatModel] = None, executor: Optional[LLMExecutor] = None,
+                 chunk_size: Optional[int] = None, question_cache: Optional[ResultCache] = None,
+                 understanding_cache: Optional[ResultCache] = None):
+        self.llm = llm or get_llm()
+        self.executor = executor or llm_executor
+        self.chunk_size = chunk_size or int(os.getenv("QUESTION_CHUNK_SIZE", "5"))
+        self.question_cache = question_cache or ResultCache()
+        self.understanding_cache = understanding_cache or ResultCache()
+
+    async def access_user_understandling(self, user_assessment : str, fresh : bool = False):
+        return await self.understanding_cache.get_or_compute(
+            normalize_assessment(user_assessment),
+            lambda: self._access_user_understandling(user_assessment),
+            fresh,
+        )
+
+    async def _access_user_understandling(self, user_assessment : str):
+        chat_prompt = ChatPromptTemplate.from_template(f"""
+                                                       You are an expert in understanding the user's understanding of the subject.
+                                                       You are given a user assessment and you need to understand the user's understanding of the subject.
+                                                       You need to return the user's understanding of the subject on a scale of 1 to 10.
+                                                       The user assessment is as follows:
+                                                       {{user_assessment}}
+
+                                                       The output should only contain the score and nothing else.
+                                                       """)
+
+        chain = chat_prompt | self.llm
+
+        async def invoke():
+            with timed("llm_understanding"):
+                return await chain.ainvoke({"user_assessment": user_assessment})
+
+        response = await self.executor.run(invoke)
+        return response.content
+
+
+
+    async def generate_questions(self, user_assessment : str, user_score : int, number_of_questions : int,question_type : str, fresh : bool = False):
+        if not self.llm:
+            raise ValueError("LLM is required passed None ")
+        if question_type not in QUESTION_CLASSES:
+            raise ValueError("Unknown question type: " + str(question_type))
+        return await self.question_cache.get_or_compute(
+            self._question_key(user_assessment, user_score, number_of_questions, question_type),
+            lambda: self._generate_questions(user_assessment, user_score, number_of_questions, question_type),
+            fresh,
+        )
+
+    def _question_key(self, user_assessment : str, user_score : int, number_of_questions : int, question_type : str):
+        return (normalize_assessment(user_assessment), score_bucket(user_score), question_type, number_of_questions)
+
+    async def _generate_questions(self, user_assessment : str, user_score : int, number_of_questions : int, question_type : str):
+        question_class, question_enum = QUESTION_CLASSES[question_type]
+        question = question_class(question_enum)
+
+        # Large requests are split into chunks that are generated concurrently.
+        responses = await asyncio.gather(*(
+            self.executor.run(lambda size=size: question.generate_question(user_assessment, user_score, size, self.llm))
+            for size in split_count(number_of_questions, self.chunk_size)
+        ))
+        questions = []
+        with timed("question_parse"):
+            for response in responses:
+                questions.extend(parse_questions(response.content))
+        return questions
+
+    async def generate_question_sets(self, user_assessment : str, user_score : int, number_of_questions : int, question_types : list[str], fresh : bool = False):
+        results = await asyncio.gather(*(
+            self.generate_questions(user_assessment, user_score, number_of_questions, question_type, fresh)
+            for question_type in question_types
+        ))
+        return dict(zip(question_types, results))
+
+    async def stream_questions(self, user_assessment : str, user_score : int, number_of_questions : int, question_types : list[str], fresh : bool = False):
+        # Yields events as soon as they are known: the understanding score, and each
+        # question the moment its JSON object is complete in the LLM token stream.
+        for question_type in question_types:
+            if question_type not in QUESTION_CLASSES:
+                raise ValueError("Unknown question type: " + str(question_type))
+        queue: asyncio.Queue = asyncio.Queue()
+
+        async def understanding():
+            score = await self.access_user_understandling(user_assessment, fresh)
+            await queue.put({"event": "understanding", "user_understanding": score})
+
+        async def questions(question_type):
+            key = self._question_key(user_assessment, user_score, number_of_questions, question_type)
+            cached = None if fresh else self.question_cache.lookup(key)
+            if cached is not None:
+                for item in cached:
+                    await queue.put({"event": "question", "question_type": question_type, "question": item})
+                return
+            question_class, question_enum = QUESTION_CLASSES[question_type]
+            results = await asyncio.gather(*(
+                self._stream_chunk(question_class(question_enum), question_type, user_assessment, user_score, size, queue)
+                for size in split_count(number_of_questions, self.chunk_size)
+            ), return_exceptions=True)
+            valid = []
+            failed = False
+            for result in results:
+                if isinstance(result, Exception):
+                    failed = True
+                    await queue.put({"event": "error", "question_type": question_type, "error": str(result)})
+                else:
+                    valid.extend(result)
+            # Only complete answers are cached, like the non-streaming path.
+            if valid and not failed:
+                self.question_cache.set(key, valid)
+
+        async def guarded(producer, question_type=None):
+            try:
+                await producer
+            except Exception as e:
+                await queue.put({"event": "error", "question_type": question_type, "error": str(e)})
+            finally:
+                await queue.put(None)
+
+        tasks = [asyncio.ensure_future(guarded(understanding()))]
+        tasks += [asyncio.ensure_future(guarded(questions(question_type), question_type)) for question_type in question_types]
+        remaining = len(tasks)
+        count = 0
+        try:
+            while remaining:
+                event = await queue.get()
+                if event is None:
+                    remaining -= 1
+                    continue
+                if event["event"] == "question":
+                    count += 1
+                yield event
+            yield {"event": "done", "questions": count}
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    async def _stream_chunk(self, question : Question, question_type : str, user_assessment : str, user_score : int, number_of_questions : int, queue : asyncio.Queue):
+        parser = QuestionStreamParser()
+        valid = []
+        async with self.executor.slot():
+            async for text in question.stream_question(user_assessment, user_score, number_of_questions, self.llm):
+                for item in parser.feed(text):
+                    error = validate_question(question.type, item)
+                    if error:
+                        await queue.put({"event": "invalid", "question_type": question_type, "error": error, "question": item})
+                    else:
+                        valid.append(item)
+                        await queue.put({"event": "question", "question_type": question_type, "question": item})
+        return valid
+
+    def cache_stats(self):
+        return {
+            "questions": self.question_cache.stats(),
+            "understanding": self.understanding_cache.stats(),
+        }
+
+
+    def generate_pdf(self, questions : Dict[Question_Type, list[Dict]]):
+
+        for question_type, questions in questions.items():
+            for question in questions:
+                print(question)
+
+
+
+
+
+async def main():
+    agent = Agent()
+    user_assessment = "I am a student of computer science and engineering"
+    print(await agent.access_user_understandling(user_assessment))
+    print(await agent.generate_questions(user_assessment, 5, number_of_questions=10, question_type="FILL_BLANK"))
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
+
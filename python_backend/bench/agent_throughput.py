@@ -0,0 +1,60 @@
+"""Question-generation throughput with a latency-injecting fake LLM.
+
+Runs the same burst of /agent/generate_questions payloads through
+AgentService twice: once the old way (one LLM call per question type,
+one call at a time) and once with chunked, concurrent generation.
+
+    python -m bench.agent_throughput --requests 10 --questions 20
+"""
+import argparse
+import asyncio
+import time
+
+from agent import Agent
+from bench.fake_llm import FakeLatencyChatModel
+from services.agent_service import AgentService
+from services.llm_pool import LLMExecutor
+
+QUESTION_TYPES = ["MCQ", "TRUE_FALSE", "FILL_BLANK"]
+
+
+async def run(label: str, requests: int, questions: int, chunk_size: int, concurrency: int, latency: float,
+              per_question: float):
+    llm = FakeLatencyChatModel(latency=latency, per_question=per_question)
+    service = AgentService(Agent(llm=llm, executor=LLMExecutor(max_concurrency=concurrency), chunk_size=chunk_size))
+    payload = {
+        "user_assessment": "Operating systems quiz: scheduling, paging and deadlocks.",
+        "user_score": 6,
+        "number_of_questions": questions,
+        "question_types": QUESTION_TYPES,
+        # Identical payloads would otherwise be coalesced by the question cache.
+        "fresh": True,
+    }
+    started = time.perf_counter()
+    responses = await asyncio.gather(*(service.generate_questions(payload) for _ in range(requests)))
+    elapsed = time.perf_counter() - started
+
+    errors = [response["error"] for response in responses if "error" in response]
+    generated = sum(len(items) for response in responses if "error" not in response
+                    for items in response["questions"].values())
+    print("%-8s chunk %3d  concurrency %3d  %6.2fs  %7.1f questions/s  %4d LLM calls  %d errors" % (
+        label, chunk_size, concurrency, elapsed, generated / elapsed, llm.calls, len(errors)))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=10)
+    parser.add_argument("--questions", type=int, default=20)
+    parser.add_argument("--chunk-size", type=int, default=5)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--latency", type=float, default=0.2)
+    parser.add_argument("--per-question", type=float, default=0.02)
+    args = parser.parse_args()
+
+    asyncio.run(run("serial", args.requests, args.questions, args.questions, 1, args.latency, args.per_question))
+    asyncio.run(run("pooled", args.requests, args.questions, args.chunk_size, args.concurrency, args.latency,
+                    args.per_question))
+
+
+if __name__ == "__main__":
+    main()
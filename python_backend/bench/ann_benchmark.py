@@ -0,0 +1,84 @@
+"""FAISS index benchmark on synthetic vectors.
+
+Builds flat, IVF and HNSW indexes over the same clustered random vectors and
+reports build time, batched QPS, single-query p50/p99 latency and recall@k
+against the exact flat results.
+
+    python -m bench.ann_benchmark --vectors 100000 --dimension 128 --queries 1000
+"""
+import argparse
+import time
+
+import faiss
+import numpy as np
+
+from RAG.ann import IndexType, build_index, set_search_params
+
+
+def synthetic_vectors(count: int, dimension: int, clusters: int, rng: np.random.Generator) -> np.ndarray:
+    # Clustered data, closer to real embeddings than uniform noise.
+    centers = rng.standard_normal((clusters, dimension)).astype(np.float32)
+    labels = rng.integers(0, clusters, count)
+    return centers[labels] + 0.3 * rng.standard_normal((count, dimension)).astype(np.float32)
+
+
+def recall_at_k(found: np.ndarray, truth: np.ndarray) -> float:
+    k = truth.shape[1]
+    return sum(len(set(row_found) & set(row_truth)) for row_found, row_truth in zip(found, truth)) / (len(truth) * k)
+
+
+def benchmark(index_type: IndexType, vectors: np.ndarray, queries: np.ndarray, k: int, truth, args):
+    started = time.perf_counter()
+    index = build_index(vectors, index_type, nlist=args.nlist, hnsw_m=args.hnsw_m)
+    index.add(vectors)
+    build_time = time.perf_counter() - started
+    set_search_params(index, nprobe=args.nprobe, ef_search=args.ef_search)
+
+    started = time.perf_counter()
+    _, found = index.search(queries, k)
+    qps = len(queries) / (time.perf_counter() - started)
+
+    latencies = []
+    for query in queries[: args.latency_queries]:
+        started = time.perf_counter()
+        index.search(query[None, :], k)
+        latencies.append((time.perf_counter() - started) * 1000)
+    latencies.sort()
+
+    recall = recall_at_k(found, truth) if truth is not None else 1.0
+    print("%-6s %-22s build %7.2fs  qps %10.0f  p50 %7.3fms  p99 %7.3fms  recall@%d %.3f" % (
+        index_type.value, type(index).__name__, build_time, qps,
+        latencies[len(latencies) // 2], latencies[max(0, int(len(latencies) * 0.99) - 1)], k, recall))
+    return found
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--vectors", type=int, default=100000)
+    parser.add_argument("--dimension", type=int, default=128)
+    parser.add_argument("--queries", type=int, default=1000)
+    parser.add_argument("--latency-queries", type=int, default=200)
+    parser.add_argument("--clusters", type=int, default=256)
+    parser.add_argument("-k", type=int, default=10)
+    parser.add_argument("--nlist", type=int, default=None)
+    parser.add_argument("--nprobe", type=int, default=None)
+    parser.add_argument("--hnsw-m", type=int, default=None)
+    parser.add_argument("--ef-search", type=int, default=None)
+    parser.add_argument("--threads", type=int, default=None)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    if args.threads:
+        faiss.omp_set_num_threads(args.threads)
+    rng = np.random.default_rng(args.seed)
+    vectors = synthetic_vectors(args.vectors, args.dimension, args.clusters, rng)
+    queries = synthetic_vectors(args.queries, args.dimension, args.clusters, rng)
+    print("%d vectors, d=%d, %d queries" % (args.vectors, args.dimension, args.queries))
+
+    truth = benchmark(IndexType.FLAT, vectors, queries, args.k, None, args)
+    for index_type in (IndexType.IVF, IndexType.HNSW):
+        benchmark(index_type, vectors, queries, args.k, truth, args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+import asyncio
+import json
+import re
+import time
+from typing import Any, AsyncIterator, Optional
+
+from langchain_core.language_models import BaseChatModel
+from langchain_core.messages import AIMessage, AIMessageChunk, BaseMessage
+from langchain_core.outputs import ChatGeneration, ChatGenerationChunk, ChatResult
+
+
+def fake_question(kind: str, number: int) -> dict:
+    if kind == "MCQ":
+        return {"question": "Question %d?" % number, "options": ["A", "B", "C", "D"], "answer": "A"}
+    if kind == "FILL_BLANK":
+        return {"question": "Question %d is ____." % number, "answer": ["blank"]}
+    return {"question": "Statement %d." % number, "answer": "True"}
+
+
+def fake_response(prompt: str) -> str:
+    # Answers the prompts in agent.py and Questions/* the way a model would.
+    if "scale of 1 to 10" in prompt:
+        return "6"
+    # Count the way a real model would read the prompt, including "N questions
+    # sets of M questions each", so prompts asking for more than intended show up.
+    match = re.search(r"generate (?:exactly )?(\d+) questions(?: sets of (\d+) questions each)?", prompt)
+    if not match:
+        raise ValueError("Prompt does not say how many questions to generate")
+    count = int(match.group(1)) * int(match.group(2) or 1)
+    if '"options"' in prompt:
+        kind = "MCQ"
+    elif "blank space" in prompt:
+        kind = "FILL_BLANK"
+    else:
+        kind = "TRUE_FALSE"
+    return json.dumps([fake_question(kind, number) for number in range(1, count + 1)])
+
+
+class FakeLatencyChatModel(BaseChatModel):
+    """Offline chat model that sleeps ``latency`` plus ``per_question`` seconds per requested question.
+
+    Streaming waits ``latency`` for the first token and then spreads the
+    per-question time over ``chunk_chars`` sized tokens.
+    """
+
+    latency: float = 0.2
+    per_question: float = 0.02
+    chunk_chars: int = 8
+    calls: int = 0
+
+    @property
+    def _llm_type(self) -> str:
+        return "fake-latency"
+
+    def _respond(self, messages: list[BaseMessage]) -> tuple[str, float]:
+        self.calls += 1
+        text = fake_response(messages[-1].content)
+        count = text.count('"question"')
+        return text, self.latency + self.per_question * count
+
+    def _generate(self, messages: list[BaseMessage], stop: Optional[list[str]] = None, run_manager: Any = None,
+                  **kwargs: Any) -> ChatResult:
+        text, delay = self._respond(messages)
+        time.sleep(delay)
+        return ChatResult(generations=[ChatGeneration(message=AIMessage(content=text))])
+
+    async def _agenerate(self, messages: list[BaseMessage], stop: Optional[list[str]] = None, run_manager: Any = None,
+                         **kwargs: Any) -> ChatResult:
+        text, delay = self._respond(messages)
+        await asyncio.sleep(delay)
+        return ChatResult(generations=[ChatGeneration(message=AIMessage(content=text))])
+
+    async def _astream(self, messages: list[BaseMessage], stop: Optional[list[str]] = None, run_manager: Any = None,
+                       **kwargs: Any) -> AsyncIterator[ChatGenerationChunk]:
+        text, delay = self._respond(messages)
+        await asyncio.sleep(self.latency)
+        pieces = [text[start:start + self.chunk_chars] for start in range(0, len(text), self.chunk_chars)]
+        for piece in pieces:
+            await asyncio.sleep((delay - self.latency) / len(pieces))
+            yield ChatGenerationChunk(message=AIMessageChunk(content=piece))
+
+
+class ScriptedChatModel(BaseChatModel):
+    """Replays ``chunks`` as the token stream, ``delay`` seconds apart."""
+
+    chunks: list[str]
+    delay: float = 0.0
+
+    @property
+    def _llm_type(self) -> str:
+        return "scripted"
+
+    def _generate(self, messages: list[BaseMessage], stop: Optional[list[str]] = None, run_manager: Any = None,
+                  **kwargs: Any) -> ChatResult:
+        return ChatResult(generations=[ChatGeneration(message=AIMessage(content="".join(self.chunks)))])
+
+    async def _astream(self, messages: list[BaseMessage], stop: Optional[list[str]] = None, run_manager: Any = None,
+                       **kwargs: Any) -> AsyncIterator[ChatGenerationChunk]:
+        for chunk in self.chunks:
+            await asyncio.sleep(self.delay)
+            yield ChatGenerationChunk(message=AIMessageChunk(content=chunk))
@@ -0,0 +1,75 @@
+"""Burst-upload load test for the background ingest queue.
+
+Submits a burst of generated PDFs to IngestQueue with the offline HashEmbeddings
+and measures how late a 10ms heartbeat on the event loop fires meanwhile. A
+responsive loop keeps the lag in the low milliseconds however many uploads
+are in flight.
+
+    python -m bench.ingest_load --uploads 16 --pages 40
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import tempfile
+import time
+
+from bench.pdf_fixtures import write_text_pdf
+from RAG.Ingestor import RAG, HashEmbeddings
+from RAG.registry import IndexRegistry
+from services.ingest_queue import IngestQueue, JobStatus
+
+
+async def heartbeat(lags: list[float], stop: asyncio.Event, interval: float = 0.01):
+    while not stop.is_set():
+        started = time.perf_counter()
+        await asyncio.sleep(interval)
+        lags.append(time.perf_counter() - started - interval)
+
+
+async def run(uploads: int, pages: int, concurrency: int, workers: int):
+    with tempfile.TemporaryDirectory() as workdir:
+        paths = [write_text_pdf(os.path.join(workdir, "upload_%d.pdf" % i), pages, seed=i) for i in range(uploads)]
+
+        registry = IndexRegistry(root=os.path.join(workdir, "indexes"))
+        embeddings = HashEmbeddings()
+        queue = IngestQueue(max_concurrency=concurrency, process_workers=workers,
+                            rag_factory=lambda: RAG(embeddings=embeddings, registry=registry))
+        lags: list[float] = []
+        stop = asyncio.Event()
+        probe = asyncio.create_task(heartbeat(lags, stop))
+
+        started = time.perf_counter()
+        submit_times = []
+        for number, path in enumerate(paths):
+            submit_started = time.perf_counter()
+            queue.submit(path, "upload_%d" % number)
+            submit_times.append(time.perf_counter() - submit_started)
+        await queue.join()
+        elapsed = time.perf_counter() - started
+
+        stop.set()
+        await probe
+        queue.shutdown()
+
+    failed = [job for job in queue.jobs.values() if job.status != JobStatus.DONE]
+    lags_ms = sorted(lag * 1000 for lag in lags)
+    print("uploads            %d x %d pages" % (uploads, pages))
+    print("concurrency        %d jobs, %d extraction processes" % (concurrency, workers))
+    print("failed jobs        %d" % len(failed))
+    print("total time         %.2fs (%.1f pages/s)" % (elapsed, uploads * pages / elapsed))
+    print("max submit time    %.2fms" % (max(submit_times) * 1000))
+    print("loop lag p50/p99   %.2fms / %.2fms" % (statistics.median(lags_ms), lags_ms[int(len(lags_ms) * 0.99) - 1]))
+    print("loop lag max       %.2fms" % lags_ms[-1])
+    for job in failed:
+        print("  %s: %s" % (job.path, job.error))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--uploads", type=int, default=16)
+    parser.add_argument("--pages", type=int, default=40)
+    parser.add_argument("--concurrency", type=int, default=2)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    args = parser.parse_args()
+    asyncio.run(run(args.uploads, args.pages, args.concurrency, args.workers))
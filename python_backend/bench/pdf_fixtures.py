@@ -0,0 +1,58 @@
+import random
+
+WORDS = (
+    "process thread memory cache index vector query chunk page latency throughput "
+    "student course lecture assessment question answer score topic network graph "
+    "algorithm database schema function variable compiler runtime kernel socket"
+).split()
+
+
+def _escape(text: str) -> str:
+    return text.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+
+
+def make_lines(rng: random.Random, count: int, words_per_line: int = 12) -> list[str]:
+    return [" ".join(rng.choice(WORDS) for _ in range(words_per_line)) for _ in range(count)]
+
+
+def write_text_pdf(path: str, pages: int, lines_per_page: int = 40, seed: int = 0) -> str:
+    # Writes a plain PDF (Helvetica text, no compression) that PyPDF2 can
+    # extract text from, without needing a PDF library to create it.
+    rng = random.Random(seed)
+    objects = []
+    page_ids = []
+    font_id = 3
+    objects.append(b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>")
+    for _ in range(pages):
+        lines = make_lines(rng, lines_per_page)
+        stream = "BT /F1 10 Tf 14 TL 40 800 Td " + " ".join("(%s) '" % _escape(line) for line in lines) + " ET"
+        stream = stream.encode("latin-1")
+        objects.append(b"<< /Length %d >>\nstream\n" % len(stream) + stream + b"\nendstream")
+        content_id = len(objects) + 2
+        objects.append(
+            b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 842] "
+            b"/Resources << /Font << /F1 %d 0 R >> >> /Contents %d 0 R >>" % (font_id, content_id)
+        )
+        page_ids.append(len(objects) + 2)
+
+    kids = b" ".join(b"%d 0 R" % page_id for page_id in page_ids)
+    header = [
+        b"<< /Type /Catalog /Pages 2 0 R >>",
+        b"<< /Type /Pages /Kids [" + kids + b"] /Count %d >>" % pages,
+    ]
+    body = header + objects
+
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, obj in enumerate(body, 1):
+        offsets.append(len(out))
+        out += b"%d 0 obj\n" % number + obj + b"\nendobj\n"
+    xref = len(out)
+    out += b"xref\n0 %d\n0000000000 65535 f \n" % (len(body) + 1)
+    for offset in offsets:
+        out += b"%010d 00000 n \n" % offset
+    out += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(body) + 1, xref)
+
+    with open(path, "wb") as file:
+        file.write(out)
+    return path
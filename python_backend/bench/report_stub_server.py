@@ -0,0 +1,79 @@
+"""Stub reporting API for exercising workers.export_reports offline.
+
+Accepts POSTed reports (one object or a list), optionally sleeping and
+failing a fraction of requests (503 by default), and prints the running total.
+
+    python -m bench.report_stub_server --port 9000 --latency 0.02 --failure-rate 0.1
+"""
+import argparse
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+class ReportStubServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address, latency: float = 0.0, failure_rate: float = 0.0, seed: int = 0,
+                 failure_status: int = 503):
+        super().__init__(address, ReportHandler)
+        self.latency = latency
+        self.failure_rate = failure_rate
+        self.failure_status = failure_status
+        self.random = random.Random(seed)
+        self.lock = threading.Lock()
+        self.reports = 0
+        self.requests = 0
+        self.rejected = 0
+        self.received_ids = set()
+        self.payloads = []
+
+
+class ReportHandler(BaseHTTPRequestHandler):
+    def do_POST(self):
+        server = self.server
+        body = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))) or b"null")
+        time.sleep(server.latency)
+        with server.lock:
+            server.requests += 1
+            fail = server.random.random() < server.failure_rate
+            if fail:
+                server.rejected += 1
+            else:
+                reports = body if isinstance(body, list) else [body]
+                server.payloads.append(body)
+                server.reports += len(reports)
+                server.received_ids.update(report.get("_id") for report in reports)
+        self.send_response(server.failure_status if fail else 200)
+        self.send_header("Content-Type", "application/json")
+        self.end_headers()
+        self.wfile.write(b'{"ok": %s}' % (b"false" if fail else b"true"))
+
+    def log_message(self, format, *args):
+        pass
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=9000)
+    parser.add_argument("--latency", type=float, default=0.02)
+    parser.add_argument("--failure-rate", type=float, default=0.0)
+    args = parser.parse_args()
+
+    server = ReportStubServer((args.host, args.port), args.latency, args.failure_rate)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    print("listening on http://%s:%d/" % (args.host, args.port))
+    try:
+        while True:
+            time.sleep(5)
+            print("%d reports (%d unique), %d requests, %d rejected" % (
+                server.reports, len(server.received_ids), server.requests, server.rejected))
+    except KeyboardInterrupt:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
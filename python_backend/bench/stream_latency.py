@@ -0,0 +1,56 @@
+"""Time to first question: batch endpoint vs the NDJSON stream.
+
+Uses the latency-injecting fake LLM, so the numbers only depend on how
+soon each path can hand a question to the client.
+
+    python -m bench.stream_latency --questions 20 --per-question 0.05
+"""
+import argparse
+import asyncio
+import json
+import time
+
+from agent import Agent
+from bench.fake_llm import FakeLatencyChatModel
+from services.agent_service import AgentService
+from services.llm_pool import LLMExecutor
+
+
+def make_service(args) -> AgentService:
+    llm = FakeLatencyChatModel(latency=args.latency, per_question=args.per_question)
+    return AgentService(Agent(llm=llm, executor=LLMExecutor(max_concurrency=16), chunk_size=args.chunk_size))
+
+
+async def run(args):
+    payload = {
+        "user_assessment": "Databases quiz: normalization, indexes and transactions.",
+        "user_score": 4,
+        "number_of_questions": args.questions,
+        "question_types": ["MCQ"],
+        "fresh": True,
+    }
+
+    started = time.perf_counter()
+    response = await make_service(args).generate_questions(payload)
+    batch = time.perf_counter() - started
+    print("batch    first question %6.3fs  all %6.3fs  (%d questions)" % (
+        batch, batch, len(response["questions"]["MCQ"])))
+
+    started = time.perf_counter()
+    first = None
+    count = 0
+    async for line in make_service(args).stream_questions(payload):
+        event = json.loads(line)
+        if event["event"] == "question":
+            count += 1
+            first = first or time.perf_counter() - started
+    print("stream   first question %6.3fs  all %6.3fs  (%d questions)" % (first or 0, time.perf_counter() - started, count))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--questions", type=int, default=20)
+    parser.add_argument("--chunk-size", type=int, default=10)
+    parser.add_argument("--latency", type=float, default=0.3)
+    parser.add_argument("--per-question", type=float, default=0.05)
+    asyncio.run(run(parser.parse_args()))
@@ -0,0 +1,142 @@
+"""Offline regression benchmark for ingest, retrieval and question generation.
+
+Everything is local and seeded: generated PDFs, HashEmbeddings and the
+latency-injecting fake LLM, so runs on the same machine are comparable.
+Prints throughput and the per-stage means collected by services.metrics.
+Save a run with --output and compare later runs against it with --baseline;
+the exit code is 1 if any throughput dropped by more than --tolerance.
+
+    python -m bench.suite --output baseline.json
+    python -m bench.suite --baseline baseline.json --tolerance 0.2
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+
+from agent import Agent
+from bench.fake_llm import FakeLatencyChatModel
+from bench.pdf_fixtures import make_lines, write_text_pdf
+from RAG.Ingestor import RAG, HashEmbeddings
+from RAG.registry import IndexRegistry
+from services.llm_pool import LLMExecutor
+from services.metrics import registry, stage_summary
+
+
+def bench_ingest(workdir: str, args) -> float:
+    path = write_text_pdf(os.path.join(workdir, "suite.pdf"), args.pages, seed=args.seed)
+    rag = RAG(embeddings=HashEmbeddings(), registry=IndexRegistry(root=os.path.join(workdir, "indexes")))
+    rag.set_file_path(path)
+    rates = []
+    for _ in range(args.repeat):
+        started = time.perf_counter()
+        rag.ingest("suite")
+        rates.append(args.pages / (time.perf_counter() - started))
+    return statistics.median(rates)
+
+
+def bench_retrieve(workdir: str, args) -> tuple[float, float]:
+    rag = RAG(embeddings=HashEmbeddings(), registry=IndexRegistry(root=os.path.join(workdir, "indexes")))
+    queries = make_lines(random.Random(args.seed), args.queries, words_per_line=6)
+    rag.get_relevalant_chunks(queries[0], "suite")
+
+    single = []
+    batch = []
+    for _ in range(args.repeat):
+        started = time.perf_counter()
+        for query in queries:
+            rag.get_relevalant_chunks(query, "suite")
+        single.append(len(queries) / (time.perf_counter() - started))
+
+        started = time.perf_counter()
+        for start in range(0, len(queries), args.batch_size):
+            rag.get_relevant_chunks_batch(queries[start:start + args.batch_size], doc_id="suite")
+        batch.append(len(queries) / (time.perf_counter() - started))
+    return statistics.median(single), statistics.median(batch)
+
+
+async def bench_questions(args) -> float:
+    llm = FakeLatencyChatModel(latency=args.llm_latency, per_question=args.llm_per_question)
+    agent = Agent(llm=llm, executor=LLMExecutor(max_concurrency=args.llm_concurrency))
+    rates = []
+    for round in range(args.repeat):
+        started = time.perf_counter()
+        results = await asyncio.gather(*(
+            agent.generate_questions("assessment %d/%d" % (round, number), 5, args.questions, "MCQ", fresh=True)
+            for number in range(args.requests)
+        ))
+        rates.append(sum(len(questions) for questions in results) / (time.perf_counter() - started))
+    return statistics.median(rates)
+
+
+def compare(results: dict, baseline: dict, tolerance: float) -> list[str]:
+    regressions = []
+    for name, value in results["throughput"].items():
+        previous = baseline.get("throughput", {}).get(name)
+        if previous and value < previous * (1 - tolerance):
+            regressions.append("%s: %.1f -> %.1f (%.0f%%)" % (name, previous, value, (value / previous - 1) * 100))
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--pages", type=int, default=100)
+    parser.add_argument("--queries", type=int, default=500)
+    parser.add_argument("--batch-size", type=int, default=64)
+    parser.add_argument("--requests", type=int, default=20, help="concurrent question requests")
+    parser.add_argument("--questions", type=int, default=10, help="questions per request")
+    parser.add_argument("--llm-latency", type=float, default=0.05)
+    parser.add_argument("--llm-per-question", type=float, default=0.005)
+    parser.add_argument("--llm-concurrency", type=int, default=8)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="write results as JSON")
+    parser.add_argument("--baseline", help="JSON from an earlier --output to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.2)
+    args = parser.parse_args()
+
+    registry.reset()
+    with tempfile.TemporaryDirectory() as workdir:
+        ingest = bench_ingest(workdir, args)
+        retrieve, retrieve_batch = bench_retrieve(workdir, args)
+    questions = asyncio.run(bench_questions(args))
+
+    results = {
+        "config": {key: value for key, value in vars(args).items() if key not in ("output", "baseline")},
+        "throughput": {
+            "ingest_pages_per_second": ingest,
+            "retrieve_queries_per_second": retrieve,
+            "retrieve_batch_queries_per_second": retrieve_batch,
+            "questions_per_second": questions,
+        },
+        "stages": stage_summary(),
+    }
+
+    for name, value in results["throughput"].items():
+        print("%-36s %10.1f" % (name, value))
+    print()
+    print("%-20s %8s %12s" % ("stage", "count", "mean ms"))
+    for stage, summary in sorted(results["stages"].items()):
+        print("%-20s %8d %12.3f" % (stage, summary["count"], summary["mean"] * 1000))
+
+    if args.output:
+        with open(args.output, "w") as file:
+            json.dump(results, file, indent=2)
+    if args.baseline:
+        with open(args.baseline) as file:
+            regressions = compare(results, json.load(file), args.tolerance)
+        if regressions:
+            print("\nregressions beyond %.0f%%:" % (args.tolerance * 100))
+            for line in regressions:
+                print("  " + line)
+            sys.exit(1)
+        print("\nno regressions beyond %.0f%%" % (args.tolerance * 100))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+import time
+from fastapi import FastAPI, Request
+from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import Response
+import uvicorn
+from fastapi import APIRouter
+from routes import rag, agent
+from services.metrics import CONTENT_TYPE, REQUEST_SECONDS, registry
+
+# Create FastAPI app
+app = FastAPI(
+    title="FastAPI Backend",
+    description="A simple FastAPI backend application",
+    version="0.1.0"
+)
+
+# Configure CORS
+app.add_middleware(
+    CORSMiddleware,
+    allow_origins=["*"],
+    allow_credentials=True,
+    allow_methods=["*"],
+    allow_headers=["*"],
+)
+
+@app.middleware("http")
+async def time_requests(request: Request, call_next):
+    started = time.perf_counter()
+    status = 500
+    try:
+        response = await call_next(request)
+        status = response.status_code
+        return response
+    finally:
+        # Label by route template, not the raw path, so ids don't create new series.
+        route = request.scope.get("route")
+        REQUEST_SECONDS.observe(time.perf_counter() - started, request.method,
+                                route.path if route else "unmatched", str(status))
+
+
+app.include_router(rag.router, prefix="/rag")
+app.include_router(agent.router, prefix="/agent")
+# Root endpoint
+@app.get("/")
+async def root():
+    return {"message": "Welcome to FastAPI Backend"}
+
+# Health check endpoint
+@app.get("/health")
+async def health_check():
+    return {"status": "healthy"}
+
+# Prometheus scrape endpoint
+@app.get("/metrics")
+async def metrics():
+    return Response(registry.render(), media_type=CONTENT_TYPE)
+
+@app.on_event("shutdown")
+async def shutdown():
+    rag.rag_service.ingest_queue.shutdown()
+
+# Include routers from routes folder
+# from routes import some_router
+# app.include_router(some_router.router)
+
+if __name__ == "__main__":
+    # Run the application with Uvicorn
+    uvicorn.run("main:app", host="0.0.0.0", port=8000, reload=True) 
\ No newline at end of file
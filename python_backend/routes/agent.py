@@ -0,0 +1,43 @@
+
+
+
+
+import os
+from fastapi import APIRouter, Request
+from fastapi.responses import StreamingResponse
+from langchain_openai import ChatOpenAI
+
+from services.agent_service import AgentService
+
+router = APIRouter()
+agent_service = AgentService()
+
+
+class Agent:
+    def __init__(self):
+        pass
+
+
+    @router.post("/generate_questions")
+    async def generate_questions(requests: Request):#user_assessment : str, user_score : int, number_of_questions : int,question_type : str)
+        
+        data = await requests.json()
+
+        
+        
+        response = await agent_service.generate_questions(data)
+        return response
+
+
+    @router.post("/generate_questions/stream")
+    async def generate_questions_stream(requests: Request):
+
+        # Same payload as /generate_questions, answered as NDJSON events while the LLM is still writing.
+        data = await requests.json()
+
+        return StreamingResponse(agent_service.stream_questions(data), media_type="application/x-ndjson")
+
+    @router.get("/cache_stats")
+    async def cache_stats():
+
+        return agent_service.cache_stats()
@@ -0,0 +1,91 @@
+
+import os
+from fastapi import APIRouter, HTTPException, Request
+from starlette.concurrency import run_in_threadpool
+from RAG.registry import DEFAULT_DOC_ID
+from services.rag_service import RAGService
+
+router = APIRouter()
+
+rag_service = RAGService()
+
+# FAISS allocates k results per query up front, so k is bounded.
+RETRIEVE_MAX_K = int(os.getenv("RETRIEVE_MAX_K", "100"))
+
+
+@router.post("/ingest")
+async def ingest(request: Request):
+
+    # Data should contain File objects
+    # Ingestion runs in the background, poll /ingest/{job_id} for progress.
+
+    data = await request.json()
+
+    try:
+        job = rag_service.submit_ingest(data["path"], data.get("doc_id", DEFAULT_DOC_ID))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    return {"message": "RAG request received", **job}
+
+
+@router.get("/ingest/{job_id}")
+async def ingest_status(job_id: str):
+
+    job = rag_service.ingest_status(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Unknown ingest job")
+
+    return job
+
+
+@router.post("/retrieve")
+async def retrieve(request: Request):
+
+    data = await request.json()
+    query = data["query"]
+
+    try:
+        # The first query for a document loads its index, keep that off the event loop.
+        return await run_in_threadpool(rag_service.retrieve, query, data.get("doc_id", DEFAULT_DOC_ID))
+    except KeyError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except RuntimeError as e:
+        raise HTTPException(status_code=503, detail=str(e))
+
+
+@router.post("/retrieve_batch")
+async def retrieve_batch(request: Request):
+
+    data = await request.json()
+    queries = data.get("queries")
+    k = data.get("k", 4)
+    if not isinstance(queries, list) or not queries or not all(isinstance(query, str) for query in queries):
+        raise HTTPException(status_code=400, detail="queries must be a non-empty list of strings")
+    if isinstance(k, bool) or not isinstance(k, int) or not 1 <= k <= RETRIEVE_MAX_K:
+        raise HTTPException(status_code=400, detail="k must be an integer between 1 and %d" % RETRIEVE_MAX_K)
+
+    try:
+        results = await run_in_threadpool(rag_service.retrieve_batch, queries, k, data.get("doc_id", DEFAULT_DOC_ID))
+    except KeyError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except RuntimeError as e:
+        raise HTTPException(status_code=503, detail=str(e))
+
+    return {"results": [{"query": query, "chunks": chunks} for query, chunks in zip(queries, results)]}
+
+
+@router.get("/indexes")
+async def indexes():
+
+    return rag_service.indexes()
+
+
+@router.get("/embedding_cache")
+async def embedding_cache():
+
+    return rag_service.embedding_cache()
@@ -0,0 +1,53 @@
+
+
+
+
+import asyncio
+import json
+
+from agent import Agent
+
+
+class AgentService:
+    def __init__(self, agent: Agent = None):
+        self.agent = agent
+
+    def get_agent(self):
+        # One Agent (and LLM client) for the whole process, built on first use.
+        if self.agent is None:
+            self.agent = Agent()
+        return self.agent
+
+    async def generate_questions(self, data):
+        try:
+            agent = self.get_agent()
+            user_assessment = data["user_assessment"]
+            user_score = data["user_score"]
+            number_of_questions = data["number_of_questions"]
+            question_types = data.get("question_types") or [data["question_type"]]
+            # fresh skips the cache for callers that need newly generated questions
+            fresh = bool(data.get("fresh", False))
+            user_understanding, questions = await asyncio.gather(
+                agent.access_user_understandling(user_assessment, fresh),
+                agent.generate_question_sets(user_assessment, user_score, number_of_questions, question_types, fresh),
+            )
+            return {"user_understanding": user_understanding, "questions": questions}
+        except Exception as e:
+            return {"error": str(e)}
+
+    async def stream_questions(self, data):
+        # NDJSON lines for StreamingResponse, one event per line.
+        try:
+            agent = self.get_agent()
+            question_types = data.get("question_types") or [data["question_type"]]
+            events = agent.stream_questions(
+                data["user_assessment"], data["user_score"], data["number_of_questions"],
+                question_types, bool(data.get("fresh", False)),
+            )
+            async for event in events:
+                yield json.dumps(event) + "\n"
+        except Exception as e:
+            yield json.dumps({"event": "error", "error": str(e)}) + "\n"
+
+    def cache_stats(self):
+        return self.agent.cache_stats() if self.agent else {}
@@ -0,0 +1,145 @@
+import asyncio
+import multiprocessing
+import os
+import time
+import uuid
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from enum import Enum
+from functools import partial
+from typing import Callable, Optional
+
+from dotenv import load_dotenv
+
+from RAG.Ingestor import RAG
+from RAG.registry import DEFAULT_DOC_ID
+
+load_dotenv()
+
+
+class JobStatus(Enum):
+    QUEUED = "queued"
+    RUNNING = "running"
+    DONE = "done"
+    FAILED = "failed"
+
+
+class IngestJob:
+    def __init__(self, path: str, doc_id: str):
+        self.id = uuid.uuid4().hex
+        self.path = path
+        self.doc_id = doc_id
+        self.status = JobStatus.QUEUED
+        self.stage = None
+        self.done = 0
+        self.total = 0
+        self.error = None
+        self.created_at = time.time()
+        self.finished_at = None
+
+    def update(self, stage: str, done: int, total: int):
+        # Called from the worker thread, plain attribute writes only.
+        self.stage = stage
+        self.done = done
+        self.total = total
+
+    def to_dict(self):
+        return {
+            "job_id": self.id,
+            "path": self.path,
+            "doc_id": self.doc_id,
+            "status": self.status.value,
+            "stage": self.stage,
+            "done": self.done,
+            "total": self.total,
+            "error": self.error,
+            "created_at": self.created_at,
+            "finished_at": self.finished_at,
+        }
+
+
+class IngestQueue:
+    """Runs RAG ingestion as background jobs off the event loop.
+
+    At most ``max_concurrency`` documents are ingested at once, each in a worker
+    thread, and PDF pages are extracted in a shared process pool.
+    """
+
+    def __init__(self, max_concurrency: Optional[int] = None, process_workers: Optional[int] = None,
+                 rag_factory: Callable[[], RAG] = RAG, max_finished_jobs: int = 1000):
+        self.max_concurrency = max_concurrency or int(os.getenv("INGEST_MAX_CONCURRENCY", "2"))
+        self.process_workers = process_workers or int(os.getenv("INGEST_PROCESS_WORKERS", str(os.cpu_count() or 1)))
+        self.rag_factory = rag_factory
+        self.max_finished_jobs = max_finished_jobs
+        self.jobs: dict[str, IngestJob] = {}
+        self._tasks: set[asyncio.Task] = set()
+        self._semaphore = None
+        self._threads = None
+        self._processes = None
+
+    def _get_semaphore(self):
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        return self._semaphore
+
+    def _get_threads(self):
+        if self._threads is None:
+            self._threads = ThreadPoolExecutor(max_workers=self.max_concurrency, thread_name_prefix="ingest")
+        return self._threads
+
+    def _get_processes(self):
+        if self._processes is None:
+            # Not fork: the server process already runs ingest and FAISS/OpenMP
+            # threads, and a forked child can inherit one of their locks held.
+            # forkserver is POSIX only; Windows falls back to spawn.
+            method = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+            self._processes = ProcessPoolExecutor(max_workers=self.process_workers,
+                                                  mp_context=multiprocessing.get_context(method))
+        return self._processes
+
+    def submit(self, path: str, doc_id: str = DEFAULT_DOC_ID) -> IngestJob:
+        # Validate the file (type and existence) and id up front so a bad request fails immediately.
+        rag = self.rag_factory()
+        rag.set_file_path(path)
+        rag.registry.doc_path(doc_id)
+        job = IngestJob(path, doc_id)
+        self.jobs[job.id] = job
+        self._prune()
+        task = asyncio.get_running_loop().create_task(self._run(job, rag))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        return job
+
+    def get(self, job_id: str) -> Optional[IngestJob]:
+        return self.jobs.get(job_id)
+
+    async def _run(self, job: IngestJob, rag: RAG):
+        async with self._get_semaphore():
+            job.status = JobStatus.RUNNING
+            loop = asyncio.get_running_loop()
+            try:
+                await loop.run_in_executor(
+                    self._get_threads(),
+                    partial(rag.ingest, doc_id=job.doc_id, executor=self._get_processes(), progress=job.update),
+                )
+            except Exception as e:
+                job.status = JobStatus.FAILED
+                job.error = str(e)
+            else:
+                job.status = JobStatus.DONE
+            finally:
+                job.finished_at = time.time()
+
+    def _prune(self):
+        finished = [job for job in self.jobs.values() if job.finished_at is not None]
+        for job in sorted(finished, key=lambda job: job.finished_at)[:max(0, len(finished) - self.max_finished_jobs)]:
+            del self.jobs[job.id]
+
+    async def join(self):
+        while self._tasks:
+            await asyncio.gather(*list(self._tasks))
+
+    def shutdown(self):
+        if self._threads is not None:
+            self._threads.shutdown(wait=False)
+        if self._processes is not None:
+            self._processes.shutdown(wait=False)
@@ -0,0 +1,91 @@
+import asyncio
+import os
+import time
+from contextlib import asynccontextmanager
+from functools import lru_cache
+from typing import Awaitable, Callable, Optional, TypeVar
+
+from dotenv import load_dotenv
+from langchain_openai import ChatOpenAI
+
+from services.metrics import observe_stage
+
+load_dotenv()
+
+T = TypeVar("T")
+
+
+@lru_cache(maxsize=None)
+def get_llm(model: str = "gpt-4o-mini", temperature: float = 0) -> ChatOpenAI:
+    # One client per model for the whole process, so its HTTP connection
+    # pool is reused across requests.
+    return ChatOpenAI(
+        model=model,
+        temperature=temperature,
+        api_key=os.getenv("OPENAI_API_KEY"),
+        timeout=float(os.getenv("LLM_TIMEOUT", "120")),
+        max_retries=int(os.getenv("LLM_MAX_RETRIES", "2")),
+    )
+
+
+class RateLimiter:
+    """Token bucket: ``rate`` calls per second with bursts of up to ``burst``. A rate of 0 disables it."""
+
+    def __init__(self, rate: float, burst: Optional[int] = None):
+        self.rate = rate
+        self.capacity = max(1, burst or int(rate) or 1)
+        self.tokens = float(self.capacity)
+        self.updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self):
+        if self.rate <= 0:
+            return
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+
+
+class LLMExecutor:
+    """Runs LLM calls behind a global concurrency cap and a rate limiter per provider."""
+
+    def __init__(self, max_concurrency: Optional[int] = None, rates: Optional[dict[str, float]] = None):
+        self.max_concurrency = max_concurrency or int(os.getenv("LLM_MAX_CONCURRENCY", "8"))
+        self.rates = rates or {}
+        self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        self._limiters: dict[str, RateLimiter] = {}
+        self.in_flight = 0
+        self.calls = 0
+
+    def limiter(self, provider: str) -> RateLimiter:
+        if provider not in self._limiters:
+            rate = self.rates.get(provider, float(os.getenv("LLM_RATE_LIMIT_" + provider.upper(), "0")))
+            self._limiters[provider] = RateLimiter(rate)
+        return self._limiters[provider]
+
+    @asynccontextmanager
+    async def slot(self, provider: str = "openai"):
+        # Held for the whole call, including streamed responses.
+        started = time.perf_counter()
+        async with self._semaphore:
+            await self.limiter(provider).acquire()
+            observe_stage("llm_slot_wait", time.perf_counter() - started)
+            self.in_flight += 1
+            self.calls += 1
+            try:
+                yield
+            finally:
+                self.in_flight -= 1
+
+    async def run(self, call: Callable[[], Awaitable[T]], provider: str = "openai") -> T:
+        async with self.slot(provider):
+            return await call()
+
+
+llm_executor = LLMExecutor()
@@ -0,0 +1,123 @@
+"""Latency histograms in the Prometheus text format.
+
+Small in-process implementation so the pipeline can be timed without another
+dependency. ``timed(stage)`` wraps a block of sync or async code and records
+its duration under ``pipeline_stage_seconds{stage=...}``; ``/metrics`` serves
+``render()``.
+"""
+import bisect
+import threading
+import time
+from contextlib import contextmanager
+from typing import Iterator, Sequence
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+DEFAULT_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format(value: float) -> str:
+    return "+Inf" if value == float("inf") else repr(float(value))
+
+
+class Histogram:
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                 buckets: Sequence[float] = DEFAULT_BUCKETS):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(sorted(buckets)) + (float("inf"),)
+        self._lock = threading.Lock()
+        # label values -> [per-bucket counts, sum]
+        self._series: dict[tuple, list] = {}
+
+    def observe(self, value: float, *labelvalues: str):
+        if len(labelvalues) != len(self.labelnames):
+            raise ValueError("%s expects labels %s" % (self.name, self.labelnames))
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.setdefault(labelvalues, [[0] * len(self.buckets), 0.0])
+            series[0][index] += 1
+            series[1] += value
+
+    @contextmanager
+    def time(self, *labelvalues: str) -> Iterator[None]:
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - started, *labelvalues)
+
+    def snapshot(self) -> dict[tuple, dict]:
+        with self._lock:
+            series = {labels: (list(counts), total) for labels, (counts, total) in self._series.items()}
+        return {labels: {"count": sum(counts), "sum": total, "buckets": counts} for labels, (counts, total) in series.items()}
+
+    def render(self) -> list[str]:
+        lines = ["# HELP %s %s" % (self.name, self.documentation), "# TYPE %s histogram" % self.name]
+        for labelvalues, series in sorted(self.snapshot().items()):
+            labels = ['%s="%s"' % (name, _escape(str(value))) for name, value in zip(self.labelnames, labelvalues)]
+            cumulative = 0
+            for bound, count in zip(self.buckets, series["buckets"]):
+                cumulative += count
+                lines.append("%s_bucket{%s} %d" % (self.name, ",".join(labels + ['le="%s"' % _format(bound)]), cumulative))
+            suffix = "{%s}" % ",".join(labels) if labels else ""
+            lines.append("%s_sum%s %s" % (self.name, suffix, _format(series["sum"])))
+            lines.append("%s_count%s %d" % (self.name, suffix, series["count"]))
+        return lines
+
+    def reset(self):
+        with self._lock:
+            self._series.clear()
+
+
+class MetricsRegistry:
+    def __init__(self):
+        self._metrics: dict[str, Histogram] = {}
+
+    def histogram(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                  buckets: Sequence[float] = DEFAULT_BUCKETS) -> Histogram:
+        if name not in self._metrics:
+            self._metrics[name] = Histogram(name, documentation, labelnames, buckets)
+        return self._metrics[name]
+
+    def render(self) -> str:
+        return "\n".join(line for metric in self._metrics.values() for line in metric.render()) + "\n"
+
+    def reset(self):
+        for metric in self._metrics.values():
+            metric.reset()
+
+
+registry = MetricsRegistry()
+
+STAGE_SECONDS = registry.histogram(
+    "pipeline_stage_seconds",
+    "Time spent in each ingest, retrieval and question generation stage.",
+    ["stage"],
+)
+REQUEST_SECONDS = registry.histogram(
+    "http_request_duration_seconds",
+    "HTTP request latency until the response headers are sent.",
+    ["method", "route", "status"],
+)
+
+
+def timed(stage: str):
+    return STAGE_SECONDS.time(stage)
+
+
+def observe_stage(stage: str, seconds: float):
+    STAGE_SECONDS.observe(seconds, stage)
+
+
+def stage_summary() -> dict[str, dict]:
+    # {stage: {"count", "sum", "mean"}}, for benchmarks and debugging.
+    return {
+        labels[0]: {"count": series["count"], "sum": series["sum"],
+                    "mean": series["sum"] / series["count"] if series["count"] else 0.0}
+        for labels, series in STAGE_SECONDS.snapshot().items()
+    }
@@ -0,0 +1,104 @@
+import asyncio
+import hashlib
+import os
+import re
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Hashable, Optional
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+
+def normalize_assessment(user_assessment: str) -> str:
+    # Case and whitespace differences should not produce a different key.
+    return hashlib.sha256(re.sub(r"\s+", " ", user_assessment).strip().lower().encode("utf-8")).hexdigest()
+
+
+def score_bucket(user_score, bucket_size: Optional[float] = None) -> int:
+    bucket_size = bucket_size or float(os.getenv("QUESTION_CACHE_SCORE_BUCKET", "2"))
+    return int(float(user_score) // bucket_size)
+
+
+class ResultCache:
+    """Async TTL + LRU cache with in-flight request coalescing.
+
+    Concurrent ``get_or_compute`` calls for the same key share one
+    computation. Failures are not cached; every waiter sees the exception.
+    """
+
+    def __init__(self, max_entries: Optional[int] = None, ttl: Optional[float] = None):
+        self.max_entries = max_entries or int(os.getenv("QUESTION_CACHE_MAX_ENTRIES", "1024"))
+        self.ttl = ttl or float(os.getenv("QUESTION_CACHE_TTL", "3600"))
+        self._entries: OrderedDict[Hashable, tuple[float, Any]] = OrderedDict()
+        self._in_flight: dict[Hashable, asyncio.Task] = {}
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.evictions = 0
+
+    def get(self, key: Hashable):
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at < time.monotonic():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return value
+
+    def lookup(self, key: Hashable):
+        # get() that counts towards the hit/miss stats, for callers that fill the cache themselves.
+        value = self.get(key)
+        if value is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return value
+
+    def set(self, key: Hashable, value):
+        self._entries[key] = (time.monotonic() + self.ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    async def get_or_compute(self, key: Hashable, compute: Callable[[], Awaitable[Any]], fresh: bool = False):
+        if not fresh:
+            value = self.get(key)
+            if value is not None:
+                self.hits += 1
+                return value
+            task = self._in_flight.get(key)
+            if task is not None:
+                self.coalesced += 1
+                return await asyncio.shield(task)
+        self.misses += 1
+
+        task = asyncio.ensure_future(compute())
+        if not fresh:
+            self._in_flight[key] = task
+
+        def done(task: asyncio.Task):
+            if self._in_flight.get(key) is task:
+                del self._in_flight[key]
+            if not task.cancelled() and task.exception() is None:
+                self.set(key, task.result())
+
+        task.add_done_callback(done)
+        # Shielded so a disconnecting client does not cancel the call other requests wait on.
+        return await asyncio.shield(task)
+
+    def stats(self):
+        lookups = self.hits + self.coalesced + self.misses
+        return {
+            "entries": len(self._entries),
+            "in_flight": len(self._in_flight),
+            "hits": self.hits,
+            "coalesced": self.coalesced,
+            "misses": self.misses,
+            "hit_rate": (self.hits + self.coalesced) / lookups if lookups else 0.0,
+            "evictions": self.evictions,
+        }
@@ -0,0 +1,48 @@
+from RAG.embedding_cache import CachedEmbeddings
+from RAG.Ingestor import RAG, shared_embeddings
+from RAG.registry import DEFAULT_DOC_ID
+from services.ingest_queue import IngestQueue
+
+class RAGService:
+    def __init__(self):
+        self.rag = RAG()
+        self.ingest_queue = IngestQueue(rag_factory=self._new_rag)
+
+    def _new_rag(self):
+        # Jobs get their own RAG (file path is per job) but share the
+        # embeddings client and the index registry. Runs on the event loop,
+        # so the embeddings are resolved later, in the job's worker thread.
+        return RAG(embeddings=self.rag.embeddings, registry=self.rag.registry)
+
+    def ingest(self, data, doc_id: str = DEFAULT_DOC_ID):
+
+        self.rag.set_file_path(data)
+        return self.rag.ingest(doc_id)
+
+    def submit_ingest(self, path: str, doc_id: str = DEFAULT_DOC_ID):
+
+        return self.ingest_queue.submit(path, doc_id).to_dict()
+
+    def ingest_status(self, job_id: str):
+
+        job = self.ingest_queue.get(job_id)
+        return job.to_dict() if job else None
+
+    def retrieve(self, query: str, doc_id: str = DEFAULT_DOC_ID):
+
+        return self.rag.get_relevalant_chunks(query, doc_id)
+
+    def retrieve_batch(self, queries: list[str], k: int = 4, doc_id: str = DEFAULT_DOC_ID):
+
+        return self.rag.get_relevant_chunks_batch(queries, k, doc_id)
+
+    def indexes(self):
+
+        return {"documents": self.rag.registry.ids(), **self.rag.registry.stats()}
+
+    def embedding_cache(self):
+
+        embeddings = self.rag.embeddings if self.rag.embeddings is not None else shared_embeddings(create=False)
+        if not isinstance(embeddings, CachedEmbeddings):
+            return {"enabled": False}
+        return {"enabled": True, **embeddings.stats()}
@@ -0,0 +1,29 @@
+import asyncio
+
+import pytest
+
+from agent import QUESTION_CLASSES, Agent, split_count
+from bench.fake_llm import FakeLatencyChatModel, fake_response
+from services.llm_pool import LLMExecutor
+
+
+def test_split_count():
+    assert split_count(12, 5) == [5, 5, 2]
+    assert split_count(5, 5) == [5]
+
+
+@pytest.mark.parametrize("question_type", list(QUESTION_CLASSES))
+def test_prompt_asks_for_exactly_the_chunk_size(question_type):
+    question_class, question_enum = QUESTION_CLASSES[question_type]
+    chain, input = question_class(question_enum).build_chain("Loops quiz", 4, 5, FakeLatencyChatModel())
+    prompt = chain.first.invoke(input).to_string()
+    assert fake_response(prompt).count('"question"') == 5
+
+
+@pytest.mark.parametrize("question_type", list(QUESTION_CLASSES))
+def test_generate_questions_returns_the_requested_count(question_type):
+    llm = FakeLatencyChatModel(latency=0, per_question=0)
+    agent = Agent(llm=llm, executor=LLMExecutor(max_concurrency=4), chunk_size=5)
+    questions = asyncio.run(agent.generate_questions("Loops quiz", 4, 12, question_type, fresh=True))
+    assert len(questions) == 12
+    assert llm.calls == 3
@@ -0,0 +1,93 @@
+import numpy as np
+
+from RAG.embedding_cache import CachedEmbeddings, EmbeddingCache
+from RAG.Ingestor import RAG, Chunker, HashEmbeddings
+from RAG.registry import IndexRegistry
+
+PARAGRAPH = "Paragraph %d talks about cache index vector query latency and page %d of the notes."
+
+
+def write_text(path, paragraphs):
+    path.write_text("\n\n".join(PARAGRAPH % (number, number) for number in range(paragraphs)))
+    return str(path)
+
+
+def chunks_of(path):
+    with open(path) as file:
+        return set(Chunker().RecursiveCharacterTextSplitter().chunk_stream([file.read()]))
+
+
+def make_rag(tmp_path):
+    cache = EmbeddingCache("hash-64", root=str(tmp_path / "cache"))
+    embeddings = CachedEmbeddings(HashEmbeddings(64), "hash-64", batch_size=4, cache=cache)
+    return RAG(embeddings=embeddings, registry=IndexRegistry(root=str(tmp_path / "indexes"))), embeddings
+
+
+def test_empty_cache_passed_in_is_used(tmp_path):
+    cache = EmbeddingCache("m", root=str(tmp_path))
+    assert CachedEmbeddings(HashEmbeddings(8), "m", cache=cache).cache is cache
+
+
+def test_reingest_embeds_only_new_chunks(tmp_path):
+    rag, embeddings = make_rag(tmp_path)
+    path = write_text(tmp_path / "notes.txt", 60)
+    first = chunks_of(path)
+
+    rag.set_file_path(path)
+    rag.ingest("notes")
+    assert (embeddings.hits, embeddings.misses) == (0, len(first))
+    calls = embeddings.provider_calls
+
+    rag.ingest("notes")
+    assert (embeddings.hits, embeddings.misses) == (len(first), len(first))
+    assert embeddings.provider_calls == calls
+
+    write_text(tmp_path / "notes.txt", 90)
+    second = chunks_of(path)
+    new = second - first
+    assert new
+    rag.ingest("notes")
+    assert embeddings.misses == len(first) + len(new)
+    assert embeddings.hits == len(first) + len(second & first)
+
+
+def test_cache_survives_reopen(tmp_path):
+    root = str(tmp_path / "cache")
+    provider = HashEmbeddings(16)
+    texts = ["alpha beta", "gamma delta", "alpha beta"]
+    expected = CachedEmbeddings(provider, "m", cache=EmbeddingCache("m", root=root)).embed_documents(texts)
+
+    reopened = CachedEmbeddings(provider, "m", cache=EmbeddingCache("m", root=root))
+    assert np.allclose(reopened.embed_documents(texts), expected)
+    assert (reopened.hits, reopened.misses, reopened.provider_calls) == (3, 0, 0)
+
+
+def test_queries_are_not_cached(tmp_path):
+    rag, embeddings = make_rag(tmp_path)
+    rag.set_file_path(write_text(tmp_path / "notes.txt", 20))
+    rag.ingest("notes")
+    entries = len(embeddings.cache)
+
+    rag.get_relevalant_chunks("cache latency", "notes")
+    rag.get_relevant_chunks_batch(["vector query", "page 3"], k=2, doc_id="notes")
+    assert len(embeddings.cache) == entries
+
+
+def test_missing_vectors_file_drops_index_entries(tmp_path):
+    root = str(tmp_path / "cache")
+    provider = HashEmbeddings(16)
+    cached = CachedEmbeddings(provider, "m", cache=EmbeddingCache("m", root=root))
+    cached.embed_documents(["alpha beta", "gamma delta"])
+    (tmp_path / "cache" / "m" / "vectors.f32").unlink()
+
+    reopened = CachedEmbeddings(provider, "m", cache=EmbeddingCache("m", root=root))
+    assert len(reopened.cache) == 0
+    assert np.allclose(reopened.embed_documents(["gamma delta", "epsilon"]),
+                       provider.embed_documents(["gamma delta", "epsilon"]))
+    assert (reopened.hits, reopened.misses) == (0, 2)
+
+    # Stale entries are gone for good: a third open only sees the new rows.
+    again = EmbeddingCache("m", root=root)
+    assert sorted(again.rows.values()) == [0, 1]
+    assert np.allclose(list(again.get_many(list(again.rows)).values()),
+                       list(reopened.cache.get_many(list(again.rows)).values()))
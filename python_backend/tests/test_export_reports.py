@@ -0,0 +1,112 @@
+import json
+import threading
+
+import mongomock
+import pytest
+
+from bench.report_stub_server import ReportStubServer
+from workers.export_reports import ReportExporter
+from workers.fixtures import seed_results
+
+
+@pytest.fixture
+def stub():
+    servers = []
+
+    def start(**kwargs):
+        server = ReportStubServer(("127.0.0.1", 0), **kwargs)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        servers.append(server)
+        return server, "http://127.0.0.1:%d/" % server.server_address[1]
+
+    yield start
+    for server in servers:
+        server.shutdown()
+        server.server_close()
+
+
+def results(db):
+    return list(db["assessmentresults"].find().sort([("createdAt", 1), ("_id", 1)]))
+
+
+def dead_lettered(path):
+    with open(path) as file:
+        return [json.loads(line) for line in file]
+
+
+def watermark(db):
+    state = db["worker_state"].find_one({"_id": "export_reports"})
+    return state["createdAt"], state["lastResultId"]
+
+
+def exporter(db, url, path, **kwargs):
+    options = {"concurrency": 4, "page_size": 10, "max_attempts": 3, "backoff": 0.001, "dead_letter_path": str(path)}
+    options.update(kwargs)
+    return ReportExporter(db, url, **options)
+
+
+def test_everything_failing_is_retried_then_dead_lettered(tmp_path, stub):
+    db = mongomock.MongoClient()["test"]
+    seed_results(db, 25)
+    server, url = stub(failure_rate=1.0)
+    path = tmp_path / "dead.jsonl"
+
+    stats = exporter(db, url, path).run()
+    assert (stats["reports"], stats["sent"], stats["failed"]) == (25, 0, 25)
+    assert stats["retries"] == 25 * 2 and stats["requests"] == server.requests == 25 * 3
+    lines = dead_lettered(path)
+    assert [line["attempts"] for line in lines] == [3] * 25
+    assert {line["error"] for line in lines} == {"HTTP 503"}
+    assert sorted(line["reports"][0]["_id"] for line in lines) == sorted(str(r["_id"]) for r in results(db))
+    # Dead-lettered pages are not exported again.
+    last = results(db)[-1]
+    assert watermark(db) == (last["createdAt"], last["_id"])
+    assert exporter(db, url, path).run()["reports"] == 0
+
+
+def test_client_errors_are_not_retried(tmp_path, stub):
+    db = mongomock.MongoClient()["test"]
+    seed_results(db, 5)
+    server, url = stub(failure_rate=1.0, failure_status=400)
+    path = tmp_path / "dead.jsonl"
+
+    stats = exporter(db, url, path).run()
+    assert (stats["failed"], stats["retries"], server.requests) == (5, 0, 5)
+    assert all(line["attempts"] == 1 for line in dead_lettered(path))
+
+
+def test_partial_failures_and_resume(tmp_path, stub):
+    db = mongomock.MongoClient()["test"]
+    seed_results(db, 120)
+    server, url = stub(failure_rate=0.2, seed=3)
+    path = tmp_path / "dead.jsonl"
+
+    stats = exporter(db, url, path, max_attempts=2).run(limit=70)
+    failed_ids = {report["_id"] for line in dead_lettered(path) for report in line["reports"]}
+    assert stats["reports"] == 70 and stats["sent"] + stats["failed"] == 70
+    assert stats["failed"] == len(failed_ids) and stats["retries"] > 0
+    assert server.received_ids.isdisjoint(failed_ids)
+    assert server.received_ids | failed_ids == {str(r["_id"]) for r in results(db)[:70]}
+    seventieth = results(db)[69]
+    assert watermark(db) == (seventieth["createdAt"], seventieth["_id"])
+
+    # A second run picks up exactly where the first stopped.
+    stats = exporter(db, url, path, max_attempts=2).run()
+    failed_ids = {report["_id"] for line in dead_lettered(path) for report in line["reports"]}
+    assert stats["reports"] == 50
+    assert server.received_ids | failed_ids == {str(r["_id"]) for r in results(db)}
+    assert server.reports == len(server.received_ids)
+
+
+def test_batches_post_lists(tmp_path, stub):
+    db = mongomock.MongoClient()["test"]
+    seed_results(db, 23)
+    server, url = stub()
+
+    stats = exporter(db, url, tmp_path / "dead.jsonl", batch_size=5).run()
+    # Pages of 10, 10 and 3 reports in batches of up to 5.
+    assert (stats["sent"], stats["requests"]) == (23, 5)
+    assert all(isinstance(payload, list) and 1 <= len(payload) <= 5 for payload in server.payloads)
+    assert sum(len(payload) for payload in server.payloads) == 23
+    assert set(server.payloads[0][0]) == {"_id", "user", "score", "maxScore", "percentage", "timeTaken",
+                                          "createdAt", "answers"}
@@ -0,0 +1,96 @@
+import asyncio
+
+import pytest
+
+from services import question_cache
+from services.question_cache import ResultCache, normalize_assessment, score_bucket
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def monotonic(self):
+        return self.now
+
+
+def test_keys_ignore_case_whitespace_and_nearby_scores():
+    assert normalize_assessment("  Loops\n and  LISTS ") == normalize_assessment("loops and lists")
+    assert score_bucket(4, 2) == score_bucket(5, 2) != score_bucket(6, 2)
+
+
+def test_ttl_expiry(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(question_cache, "time", clock)
+    cache = ResultCache(max_entries=10, ttl=60)
+    cache.set("a", 1)
+    clock.now += 59
+    assert cache.get("a") == 1
+    clock.now += 2
+    assert cache.get("a") is None
+    assert cache.stats()["entries"] == 0
+
+
+def test_lru_eviction():
+    cache = ResultCache(max_entries=2, ttl=60)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)
+    assert (cache.get("a"), cache.get("b"), cache.get("c")) == (1, None, 3)
+    assert cache.stats()["evictions"] == 1
+
+
+def test_concurrent_identical_calls_share_one_computation():
+    cache = ResultCache(max_entries=10, ttl=60)
+    calls = []
+
+    async def compute():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        return ["question"]
+
+    async def main():
+        results = await asyncio.gather(*(cache.get_or_compute("k", compute) for _ in range(10)))
+        again = await cache.get_or_compute("k", compute)
+        return results, again
+
+    results, again = asyncio.run(main())
+    assert results == [["question"]] * 10 and again == ["question"]
+    assert len(calls) == 1
+    stats = cache.stats()
+    assert (stats["misses"], stats["coalesced"], stats["hits"], stats["in_flight"]) == (1, 9, 1, 0)
+
+
+def test_failures_are_not_cached():
+    cache = ResultCache(max_entries=10, ttl=60)
+    attempts = []
+
+    async def flaky():
+        attempts.append(1)
+        await asyncio.sleep(0)
+        if len(attempts) == 1:
+            raise TimeoutError("LLM timed out")
+        return "ok"
+
+    async def main():
+        first = await asyncio.gather(*(cache.get_or_compute("k", flaky) for _ in range(3)), return_exceptions=True)
+        return first, await cache.get_or_compute("k", flaky)
+
+    first, second = asyncio.run(main())
+    assert all(isinstance(result, TimeoutError) for result in first)
+    assert second == "ok" and len(attempts) == 2
+
+
+def test_fresh_bypasses_and_refreshes_the_cache():
+    cache = ResultCache(max_entries=10, ttl=60)
+    cache.set("k", "old")
+    values = iter(["new", "newer"])
+
+    async def compute():
+        return next(values)
+
+    async def main():
+        return [await cache.get_or_compute("k", compute, fresh=True), await cache.get_or_compute("k", compute)]
+
+    assert asyncio.run(main()) == ["new", "new"]
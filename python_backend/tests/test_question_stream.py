@@ -0,0 +1,88 @@
+import asyncio
+import json
+
+import pytest
+from fastapi.testclient import TestClient
+
+from agent import Agent
+from bench.fake_llm import ScriptedChatModel
+from Questions.stream import QuestionStreamParser
+from services.agent_service import AgentService
+from services.llm_pool import LLMExecutor
+
+QUESTIONS = [
+    {"question": 'What does "{x}" print?', "options": ["{", "}", "[", "]"], "answer": "{"},
+    {"question": "Only one option", "options": ["A"], "answer": "A"},
+    {"question": "Is \\ a backslash?", "options": {"a": "yes", "b": "no"}, "answer": "a"},
+]
+FENCED = "```json\n" + json.dumps({"questions": QUESTIONS}) + "\n```"
+
+
+def split(text, size):
+    return [text[start:start + size] for start in range(0, len(text), size)]
+
+
+def parse(chunks):
+    parser = QuestionStreamParser()
+    return [item for chunk in chunks for item in parser.feed(chunk)]
+
+
+@pytest.mark.parametrize("size", [1, 2, 3, 7, 64])
+def test_parser_handles_any_split(size):
+    assert parse(split(FENCED, size)) == QUESTIONS
+
+
+def test_parser_splits_inside_escapes():
+    text = json.dumps(QUESTIONS)
+    cut = text.index('\\"') + 1
+    assert parse([text[:cut], text[cut:]]) == QUESTIONS
+
+
+def test_parser_reads_nested_question_sets():
+    text = json.dumps([[QUESTIONS[0]], [QUESTIONS[2]]])
+    assert parse(split(text, 5)) == [QUESTIONS[0], QUESTIONS[2]]
+
+
+def make_service(size):
+    llm = ScriptedChatModel(chunks=split(FENCED, size))
+    return AgentService(Agent(llm=llm, executor=LLMExecutor(max_concurrency=4), chunk_size=10))
+
+
+PAYLOAD = {
+    "user_assessment": "Strings and escaping quiz",
+    "user_score": 4,
+    "number_of_questions": 3,
+    "question_types": ["MCQ"],
+    "fresh": True,
+}
+
+
+def check_events(events):
+    assert events[-1] == {"event": "done", "questions": 2}
+    assert [event["event"] for event in events].count("understanding") == 1
+    stream = [event for event in events if event["event"] in ("question", "invalid")]
+    assert [event["event"] for event in stream] == ["question", "invalid", "question"]
+    assert [event["question"] for event in stream] == QUESTIONS
+    assert all(event["question_type"] == "MCQ" for event in stream)
+    assert stream[1]["error"] == "options must list at least two choices"
+
+
+@pytest.mark.parametrize("size", [1, 5, 13])
+def test_stream_emits_ndjson_events_in_order(size):
+    async def collect():
+        return [line async for line in make_service(size).stream_questions(PAYLOAD)]
+
+    lines = asyncio.run(collect())
+    assert all(line.endswith("\n") for line in lines)
+    check_events([json.loads(line) for line in lines])
+
+
+def test_stream_endpoint(monkeypatch):
+    from main import app
+    from routes import agent as agent_routes
+
+    monkeypatch.setattr(agent_routes, "agent_service", make_service(4))
+    response = TestClient(app).post("/agent/generate_questions/stream", json=PAYLOAD)
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    check_events([json.loads(line) for line in response.text.splitlines()])
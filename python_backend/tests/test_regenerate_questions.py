@@ -0,0 +1,77 @@
+import asyncio
+
+import mongomock
+
+from agent import Agent
+from bench.fake_llm import FakeLatencyChatModel
+from services.llm_pool import LLMExecutor
+from workers.fixtures import seed_results
+from workers.regenerate_questions import RegenerationWorker, idempotency_key
+
+
+class FlakyAgent:
+    """Answers like the Agent, but fails for results whose score is in ``failing``."""
+
+    def __init__(self, failing):
+        self.failing = set(failing)
+        self.calls = 0
+
+    async def generate_question_sets(self, user_assessment, user_score, number_of_questions, question_types):
+        self.calls += 1
+        if user_score in self.failing:
+            raise TimeoutError("LLM timed out")
+        return {question_type: [{"question": "Q?", "answer": "A"}] * number_of_questions
+                for question_type in question_types}
+
+
+def run(coroutine):
+    return asyncio.run(coroutine)
+
+
+def test_failures_are_recorded_and_retried():
+    db = mongomock.MongoClient()["test"]
+    seed_results(db, 40)
+    failing_ids = {result["_id"] for result in db["assessmentresults"].find({"percentage": {"$in": [30, 70]}})}
+    agent = FlakyAgent({30, 70})
+
+    worker = RegenerationWorker(db, agent, ["MCQ", "TRUE_FALSE"], number_of_questions=2, page_size=7)
+    stats = run(worker.run())
+    assert stats["rows"] == 40 and stats["failed"] == len(failing_ids) == 8
+    assert db["generated_questions"].count_documents({}) == 2 * (40 - 8)
+    assert {failure["resultId"] for failure in db["regeneration_failures"].find()} == failing_ids
+    assert db["worker_state"].find_one({"_id": "regenerate_questions"})["lastResultId"] == max(
+        result["_id"] for result in db["assessmentresults"].find())
+
+    # Still failing: entries stay and count their attempts.
+    stats = run(RegenerationWorker(db, agent, ["MCQ", "TRUE_FALSE"], 2, page_size=3).retry_failures())
+    assert (stats["failed"], stats["recovered"]) == (8, 0)
+    assert {failure["attempts"] for failure in db["regeneration_failures"].find()} == {2}
+
+    agent.failing.clear()
+    calls = agent.calls
+    stats = run(RegenerationWorker(db, agent, ["MCQ", "TRUE_FALSE"], 2, page_size=3).retry_failures())
+    assert (stats["rows"], stats["failed"], stats["recovered"]) == (8, 0, 8)
+    assert agent.calls == calls + 8
+    assert db["regeneration_failures"].count_documents({}) == 0
+    assert db["generated_questions"].count_documents({}) == 2 * 40
+    for result_id in failing_ids:
+        assert db["generated_questions"].find_one({"_id": idempotency_key(result_id, "MCQ", 2)})
+
+    # Nothing left to do, and nothing is generated twice.
+    stats = run(RegenerationWorker(db, agent, ["MCQ", "TRUE_FALSE"], 2).run())
+    assert stats["rows"] == 0 and agent.calls == calls + 8
+
+
+def test_answers_with_braces_are_not_template_variables():
+    db = mongomock.MongoClient()["test"]
+    seed_results(db, 1)
+    db["assessmentresults"].update_one({}, {"$set": {"answers": [{
+        "question": "What does {} create in Python?", "userAnswer": "{'a': 'b'}",
+        "correctAnswer": "{}", "isCorrect": False}]}})
+    llm = FakeLatencyChatModel(latency=0, per_question=0)
+    agent = Agent(llm=llm, executor=LLMExecutor(max_concurrency=4), chunk_size=5)
+
+    stats = run(RegenerationWorker(db, agent, ["MCQ", "TRUE_FALSE", "FILL_BLANK"], 2).run())
+    assert (stats["rows"], stats["failed"]) == (1, 0)
+    assert db["regeneration_failures"].count_documents({}) == 0
+    assert [len(doc["questions"]) for doc in db["generated_questions"].find()] == [2, 2, 2]
@@ -0,0 +1,24 @@
+from RAG.Ingestor import RAG, HashEmbeddings, VectorStore
+from RAG.registry import DEFAULT_DOC_ID, IndexRegistry
+
+
+def test_ids_skips_invalid_names(tmp_path):
+    registry = IndexRegistry(root=str(tmp_path / "indexes"), legacy_path=str(tmp_path / "legacy"))
+    registry.save("notes", VectorStore().FAISSVectorStore(["alpha beta", "gamma"], HashEmbeddings(8)))
+    (tmp_path / "indexes" / "not a doc id!").mkdir()
+    (tmp_path / "indexes" / "stray.txt").write_text("x")
+    assert registry.ids() == ["notes"]
+
+
+def test_legacy_index_is_migrated(tmp_path):
+    embeddings = HashEmbeddings(8)
+    VectorStore().FAISSVectorStore(["cache index", "student score"], embeddings, save_path=str(tmp_path / "legacy"))
+
+    registry = IndexRegistry(root=str(tmp_path / "indexes"), legacy_path=str(tmp_path / "legacy"))
+    assert registry.ids() == [DEFAULT_DOC_ID]
+    version = registry.current_version(DEFAULT_DOC_ID)
+    assert IndexRegistry(root=str(tmp_path / "indexes"), legacy_path=str(tmp_path / "legacy")).ids() == [DEFAULT_DOC_ID]
+    assert registry.current_version(DEFAULT_DOC_ID) == version
+
+    rag = RAG(embeddings=embeddings, registry=registry)
+    assert rag.get_relevalant_chunks("cache index") == "cache index"
@@ -0,0 +1,40 @@
+import pytest
+from fastapi.testclient import TestClient
+
+from bench.pdf_fixtures import write_text_pdf
+from RAG.Ingestor import RAG, HashEmbeddings, locate_pages
+from RAG.registry import IndexRegistry
+
+
+def test_locate_pages():
+    pages = ["alpha beta gamma ", "delta epsilon ", "zeta eta"]
+    assert locate_pages(["alpha beta", "gamma delta", "epsilon zeta", "missing"], pages) == [1, 1, 2, None]
+
+
+def test_batch_hits_carry_metadata_and_k_is_clamped(tmp_path):
+    rag = RAG(embeddings=HashEmbeddings(), registry=IndexRegistry(root=str(tmp_path / "indexes")))
+    rag.set_file_path(write_text_pdf(str(tmp_path / "doc.pdf"), 6))
+    vector_store = rag.ingest("doc")
+    total = vector_store.index.ntotal
+
+    results = rag.get_relevant_chunks_batch(["cache index", "student score"], k=10 ** 9, doc_id="doc")
+    assert [len(hits) for hits in results] == [total, total]
+    metadata = [hit["metadata"] for hit in results[0]]
+    assert {item["doc_id"] for item in metadata} == {"doc"}
+    assert sorted(item["chunk"] for item in metadata) == list(range(total))
+    assert all(1 <= item["page"] <= 6 for item in metadata)
+
+
+@pytest.mark.parametrize("payload", [
+    {"queries": ["q"], "k": 10 ** 9},
+    {"queries": ["q"], "k": "ten"},
+    {"queries": ["q"], "k": 2.5},
+    {"queries": ["q"], "k": True},
+    {"queries": "a string"},
+    {"queries": []},
+    {"queries": ["q", 3]},
+    {},
+])
+def test_retrieve_batch_rejects_bad_input(payload):
+    from main import app
+    assert TestClient(app).post("/rag/retrieve_batch", json=payload).status_code == 400
@@ -0,0 +1,211 @@
+"""Incremental export of assessment results to the reporting API.
+
+Sends every result created since the last run, oldest first. The position is
+a (createdAt, _id) watermark in ``worker_state``, read with an index-backed
+query that only projects the fields the report uses. Reports are posted
+through one pooled ``requests.Session`` by a bounded thread pool, optionally
+several per request, with exponential-backoff retries. Reports that still fail
+are appended to a dead-letter JSONL file and the export moves on.
+
+    python -m workers.export_reports --url http://localhost:9000/reports --concurrency 8
+    python -m workers.export_reports --mongomock --seed-results 500 --url http://127.0.0.1:9000/
+"""
+import argparse
+import json
+import os
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional
+
+import requests
+from bson import ObjectId
+from dotenv import load_dotenv
+from requests.adapters import HTTPAdapter
+
+from workers.fixtures import seed_results
+
+load_dotenv()
+
+WORKER_NAME = "export_reports"
+REPORT_FIELDS = {
+    "user": 1, "score": 1, "maxScore": 1, "percentage": 1, "timeTaken": 1, "createdAt": 1,
+    "answers.question": 1, "answers.userAnswer": 1, "answers.correctAnswer": 1, "answers.isCorrect": 1,
+}
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+
+def to_jsonable(value):
+    # ObjectId and datetime are what pymongo hands back that json cannot encode.
+    if isinstance(value, ObjectId):
+        return str(value)
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, dict):
+        return {key: to_jsonable(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [to_jsonable(item) for item in value]
+    return value
+
+
+class RetryableError(Exception):
+    pass
+
+
+class ReportExporter:
+    def __init__(self, db, url: str, concurrency: int = 8, batch_size: int = 1, page_size: int = 500,
+                 max_attempts: int = 5, backoff: float = 0.5, timeout: float = 10.0,
+                 dead_letter_path: str = "reports_dead_letter.jsonl", name: str = WORKER_NAME):
+        self.db = db
+        self.url = url
+        self.concurrency = concurrency
+        self.batch_size = batch_size
+        self.page_size = page_size
+        self.max_attempts = max_attempts
+        self.backoff = backoff
+        self.timeout = timeout
+        self.dead_letter_path = dead_letter_path
+        self.name = name
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=concurrency)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        self._lock = threading.Lock()
+        self.sent = 0
+        self.failed = 0
+        self.retries = 0
+        self.requests = 0
+
+    def ensure_index(self):
+        self.db["assessmentresults"].create_index([("createdAt", 1), ("_id", 1)])
+
+    def load_watermark(self):
+        state = self.db["worker_state"].find_one({"_id": self.name})
+        return (state["createdAt"], state["lastResultId"]) if state else None
+
+    def save_watermark(self, report: Dict[str, Any]):
+        self.db["worker_state"].update_one(
+            {"_id": self.name},
+            {"$set": {"createdAt": report["createdAt"], "lastResultId": report["_id"],
+                      "updatedAt": datetime.now(timezone.utc)}},
+            upsert=True,
+        )
+
+    def fetch_page(self, watermark) -> List[Dict[str, Any]]:
+        query = {}
+        if watermark is not None:
+            created_at, last_id = watermark
+            query = {"$or": [
+                {"createdAt": {"$gt": created_at}},
+                {"createdAt": created_at, "_id": {"$gt": last_id}},
+            ]}
+        cursor = self.db["assessmentresults"].find(query, REPORT_FIELDS)
+        return list(cursor.sort([("createdAt", 1), ("_id", 1)]).limit(self.page_size))
+
+    def post(self, reports: List[Dict[str, Any]]):
+        # A single report is posted as an object, like before; batches as a list.
+        body = to_jsonable(reports[0] if self.batch_size == 1 else reports)
+        for attempt in range(1, self.max_attempts + 1):
+            try:
+                with self._lock:
+                    self.requests += 1
+                response = self.session.post(self.url, json=body, timeout=self.timeout)
+                if response.status_code in RETRY_STATUSES:
+                    raise RetryableError("HTTP %d" % response.status_code)
+                response.raise_for_status()
+                with self._lock:
+                    self.sent += len(reports)
+                return
+            except (RetryableError, requests.ConnectionError, requests.Timeout) as e:
+                error = e
+                if attempt < self.max_attempts:
+                    with self._lock:
+                        self.retries += 1
+                    time.sleep(self.backoff * 2 ** (attempt - 1) * (1 + random.random()))
+            except requests.RequestException as e:
+                error = e
+                break
+        self.dead_letter(reports, error, attempt)
+
+    def dead_letter(self, reports: List[Dict[str, Any]], error: Exception, attempts: int):
+        line = json.dumps({
+            "failedAt": datetime.now(timezone.utc).isoformat(),
+            "error": str(error),
+            "attempts": attempts,
+            "reports": to_jsonable(reports),
+        })
+        with self._lock:
+            self.failed += len(reports)
+            with open(self.dead_letter_path, "a") as file:
+                file.write(line + "\n")
+
+    def run(self, limit: Optional[int] = None):
+        started = time.perf_counter()
+        self.ensure_index()
+        watermark = self.load_watermark()
+        exported = 0
+        with ThreadPoolExecutor(max_workers=self.concurrency) as pool:
+            while limit is None or exported < limit:
+                page = self.fetch_page(watermark)
+                if limit is not None:
+                    page = page[:limit - exported]
+                if not page:
+                    break
+                batches = [page[start:start + self.batch_size] for start in range(0, len(page), self.batch_size)]
+                # Every batch ends sent or dead-lettered, so the watermark can move past the page.
+                list(pool.map(self.post, batches))
+                watermark = (page[-1]["createdAt"], page[-1]["_id"])
+                self.save_watermark(page[-1])
+                exported += len(page)
+                print("%d reports, %d sent, %d dead-lettered, %d retries" % (exported, self.sent, self.failed, self.retries))
+        elapsed = time.perf_counter() - started
+        return {
+            "reports": exported,
+            "sent": self.sent,
+            "failed": self.failed,
+            "retries": self.retries,
+            "requests": self.requests,
+            "seconds": elapsed,
+            "reports_per_second": exported / elapsed if elapsed else 0.0,
+        }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--url", default=os.getenv("REPORT_API_URL"))
+    parser.add_argument("--concurrency", type=int, default=int(os.getenv("REPORT_CONCURRENCY", "8")))
+    parser.add_argument("--batch-size", type=int, default=int(os.getenv("REPORT_BATCH_SIZE", "1")))
+    parser.add_argument("--page-size", type=int, default=500)
+    parser.add_argument("--max-attempts", type=int, default=int(os.getenv("REPORT_MAX_ATTEMPTS", "5")))
+    parser.add_argument("--backoff", type=float, default=float(os.getenv("REPORT_BACKOFF", "0.5")))
+    parser.add_argument("--timeout", type=float, default=float(os.getenv("REPORT_TIMEOUT", "10")))
+    parser.add_argument("--dead-letter", default=os.getenv("REPORT_DEAD_LETTER", "reports_dead_letter.jsonl"))
+    parser.add_argument("--limit", type=int, default=None)
+    parser.add_argument("--db", default=os.getenv("MONGODB_DB", "test"))
+    parser.add_argument("--mongomock", action="store_true", help="use an in-memory mongomock database")
+    parser.add_argument("--seed-results", type=int, default=0, help="insert synthetic results first")
+    args = parser.parse_args()
+    if not args.url:
+        parser.error("set REPORT_API_URL or pass --url")
+
+    if args.mongomock:
+        import mongomock
+        client = mongomock.MongoClient()
+    else:
+        from pymongo import MongoClient
+        client = MongoClient(os.getenv("MONGODB_URL"))
+    db = client[args.db]
+    if args.seed_results:
+        seed_results(db, args.seed_results)
+
+    exporter = ReportExporter(db, args.url, args.concurrency, args.batch_size, args.page_size, args.max_attempts,
+                              args.backoff, args.timeout, args.dead_letter)
+    stats = exporter.run(args.limit)
+    print("done: %(reports)d reports in %(seconds).2fs (%(reports_per_second).1f/s), %(sent)d sent, "
+          "%(failed)d dead-lettered, %(retries)d retries, %(requests)d requests" % stats)
+
+
+if __name__ == "__main__":
+    main()
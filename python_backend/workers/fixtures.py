@@ -0,0 +1,23 @@
+from datetime import datetime, timedelta, timezone
+
+from bson import ObjectId
+
+
+def seed_results(db, count: int):
+    # Synthetic assessment results for local runs against mongomock or a scratch mongod.
+    # createdAt is spread one second apart, continuing after the newest existing result.
+    newest = db["assessmentresults"].find_one({}, {"createdAt": 1}, sort=[("createdAt", -1)])
+    start = newest["createdAt"] if newest else datetime.now(timezone.utc) - timedelta(seconds=count)
+    db["assessmentresults"].insert_many([{
+        "_id": ObjectId(),
+        "user": ObjectId(),
+        "assessment": ObjectId(),
+        "score": number % 10,
+        "maxScore": 10,
+        "percentage": (number % 10) * 10,
+        "token": 0,
+        "timeTaken": 60,
+        "answers": [{"questionId": str(q), "question": "Question %d" % q, "userAnswer": "A",
+                     "correctAnswer": "A" if q % 2 else "B", "isCorrect": bool(q % 2)} for q in range(5)],
+        "createdAt": start + timedelta(seconds=number + 1),
+    } for number in range(count)])
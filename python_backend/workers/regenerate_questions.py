@@ -0,0 +1,251 @@
+"""Batch worker that generates follow-up questions for assessment results.
+
+Pages through ``assessmentresults`` in ``_id`` order, generates questions with
+the in-process Agent and writes them to ``generated_questions``. The last
+processed ``_id`` is stored in ``worker_state`` after every page, so a crashed
+or interrupted run resumes where it stopped. Each output document's ``_id`` is
+an idempotency key, so re-running a page never duplicates questions. Results
+that fail (LLM timeouts, rate limits) are recorded in ``regeneration_failures``
+and reprocessed by ``--retry-failures``, which removes them once they succeed.
+
+    python -m workers.regenerate_questions --page-size 100 --concurrency 16
+    python -m workers.regenerate_questions --retry-failures
+    python -m workers.regenerate_questions --mongomock --fake-llm --seed-results 500
+"""
+import argparse
+import asyncio
+import hashlib
+import os
+import time
+from datetime import datetime, timezone
+from typing import Optional
+
+from dotenv import load_dotenv
+from pymongo.errors import BulkWriteError
+
+from agent import Agent
+from workers.fixtures import seed_results
+
+load_dotenv()
+
+WORKER_NAME = "regenerate_questions"
+DUPLICATE_KEY = 11000
+RESULT_FIELDS = {"user": 1, "assessment": 1, "score": 1, "maxScore": 1, "percentage": 1, "answers": 1}
+
+
+def idempotency_key(result_id, question_type: str, number_of_questions: int) -> str:
+    return hashlib.sha256(("%s:%s:%d" % (result_id, question_type, number_of_questions)).encode()).hexdigest()
+
+
+def assessment_text(result: dict) -> str:
+    # The Agent needs the attempt as text: every question with the given and correct answer.
+    lines = ["Score: %s / %s (%s%%)" % (result.get("score"), result.get("maxScore"), result.get("percentage"))]
+    for answer in result.get("answers", []):
+        lines.append("Q: %s | answered: %s | correct: %s | %s" % (
+            answer.get("question"), answer.get("userAnswer"), answer.get("correctAnswer"),
+            "right" if answer.get("isCorrect") else "wrong"))
+    return "\n".join(lines)
+
+
+class RegenerationWorker:
+    def __init__(self, db, agent: Agent, question_types: list[str], number_of_questions: int = 5,
+                 page_size: int = 100, concurrency: int = 16, name: str = WORKER_NAME):
+        self.db = db
+        self.agent = agent
+        self.question_types = question_types
+        self.number_of_questions = number_of_questions
+        self.page_size = page_size
+        self.name = name
+        self._semaphore = asyncio.Semaphore(concurrency)
+        self.rows = 0
+        self.inserted = 0
+        self.duplicates = 0
+        self.failed = 0
+        self.recovered = 0
+
+    def load_watermark(self):
+        state = self.db["worker_state"].find_one({"_id": self.name})
+        return state.get("lastResultId") if state else None
+
+    def save_watermark(self, last_id):
+        self.db["worker_state"].update_one(
+            {"_id": self.name},
+            {"$set": {"lastResultId": last_id, "updatedAt": datetime.now(timezone.utc)}},
+            upsert=True,
+        )
+
+    def fetch_page(self, after) -> list[dict]:
+        query = {"_id": {"$gt": after}} if after is not None else {}
+        return list(self.db["assessmentresults"].find(query, RESULT_FIELDS).sort("_id", 1).limit(self.page_size))
+
+    def write(self, documents: list[dict], failures: list[dict]):
+        if documents:
+            try:
+                inserted = self.db["generated_questions"].insert_many(documents, ordered=False).inserted_ids
+                self.inserted += len(inserted)
+            except BulkWriteError as e:
+                errors = e.details.get("writeErrors", [])
+                if any(error.get("code") != DUPLICATE_KEY for error in errors):
+                    raise
+                self.duplicates += len(errors)
+                self.inserted += e.details.get("nInserted", 0)
+        for failure in failures:
+            self.db["regeneration_failures"].update_one(
+                {"_id": failure["_id"]},
+                {"$set": {key: value for key, value in failure.items() if key != "_id"}, "$inc": {"attempts": 1}},
+                upsert=True,
+            )
+
+    def existing_keys(self, keys: list[str]) -> set[str]:
+        return {doc["_id"] for doc in self.db["generated_questions"].find({"_id": {"$in": keys}}, {"_id": 1})}
+
+    async def process(self, result: dict, skip: set[str]):
+        pending = [question_type for question_type in self.question_types
+                   if idempotency_key(result["_id"], question_type, self.number_of_questions) not in skip]
+        if not pending:
+            return [], []
+        async with self._semaphore:
+            try:
+                questions = await self.agent.generate_question_sets(
+                    assessment_text(result), result.get("percentage", result.get("score", 0)),
+                    self.number_of_questions, pending,
+                )
+            except Exception as e:
+                return [], [{
+                    "_id": str(result["_id"]),
+                    "resultId": result["_id"],
+                    "error": str(e),
+                    "timestamp": datetime.now(timezone.utc),
+                }]
+        now = datetime.now(timezone.utc)
+        return [{
+            "_id": idempotency_key(result["_id"], question_type, self.number_of_questions),
+            "resultId": result["_id"],
+            "userId": result.get("user"),
+            "assessmentId": result.get("assessment"),
+            "questionType": question_type,
+            "numberOfQuestions": self.number_of_questions,
+            "questions": questions[question_type],
+            "timestamp": now,
+        } for question_type in pending], []
+
+    async def process_page(self, page: list[dict]) -> list[dict]:
+        # Rows finished before a crash are skipped without calling the LLM again.
+        keys = [idempotency_key(result["_id"], question_type, self.number_of_questions)
+                for result in page for question_type in self.question_types]
+        skip = await asyncio.to_thread(self.existing_keys, keys)
+        outcomes = await asyncio.gather(*(self.process(result, skip) for result in page))
+        documents = [document for created, _ in outcomes for document in created]
+        failures = [failure for _, failed in outcomes for failure in failed]
+        await asyncio.to_thread(self.write, documents, failures)
+        self.rows += len(page)
+        self.failed += len(failures)
+        return failures
+
+    def progress(self, started: float):
+        elapsed = time.perf_counter() - started
+        print("%d rows, %d inserted, %d duplicates, %d failed, %d recovered, %.1f rows/s" % (
+            self.rows, self.inserted, self.duplicates, self.failed, self.recovered, self.rows / elapsed))
+
+    async def run(self, limit: Optional[int] = None):
+        started = time.perf_counter()
+        watermark = await asyncio.to_thread(self.load_watermark)
+        while limit is None or self.rows < limit:
+            page = await asyncio.to_thread(self.fetch_page, watermark)
+            if limit is not None:
+                page = page[:limit - self.rows]
+            if not page:
+                break
+            # Failed rows don't hold back the watermark; --retry-failures picks them up.
+            await self.process_page(page)
+            watermark = page[-1]["_id"]
+            await asyncio.to_thread(self.save_watermark, watermark)
+            self.progress(started)
+        return self.stats(time.perf_counter() - started)
+
+    def fetch_failed_page(self, after) -> list[dict]:
+        query = {"_id": {"$gt": after}} if after is not None else {}
+        return list(self.db["regeneration_failures"].find(query, {"resultId": 1}).sort("_id", 1).limit(self.page_size))
+
+    def resolve_failures(self, failure_ids: list[str]):
+        self.db["regeneration_failures"].delete_many({"_id": {"$in": failure_ids}})
+
+    async def retry_failures(self, limit: Optional[int] = None):
+        # Reprocesses recorded failures. Entries are deleted once their result
+        # succeeds (or no longer exists); failures again stay, with attempts bumped.
+        started = time.perf_counter()
+        after = None
+        while limit is None or self.rows < limit:
+            failed = await asyncio.to_thread(self.fetch_failed_page, after)
+            if limit is not None:
+                failed = failed[:limit - self.rows]
+            if not failed:
+                break
+            after = failed[-1]["_id"]
+            ids = [failure["resultId"] for failure in failed]
+            page = await asyncio.to_thread(
+                lambda: list(self.db["assessmentresults"].find({"_id": {"$in": ids}}, RESULT_FIELDS)))
+            still_failing = {failure["_id"] for failure in await self.process_page(page)}
+            resolved = [failure["_id"] for failure in failed if failure["_id"] not in still_failing]
+            await asyncio.to_thread(self.resolve_failures, resolved)
+            self.recovered += len(resolved)
+            self.progress(started)
+        return self.stats(time.perf_counter() - started)
+
+    def stats(self, elapsed: float):
+        return {
+            "rows": self.rows,
+            "inserted": self.inserted,
+            "duplicates": self.duplicates,
+            "failed": self.failed,
+            "recovered": self.recovered,
+            "seconds": elapsed,
+            "rows_per_second": self.rows / elapsed if elapsed else 0.0,
+        }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--question-types", nargs="+", default=["MCQ"])
+    parser.add_argument("--number-of-questions", type=int, default=5)
+    parser.add_argument("--page-size", type=int, default=int(os.getenv("REGENERATE_PAGE_SIZE", "100")))
+    parser.add_argument("--concurrency", type=int, default=int(os.getenv("REGENERATE_CONCURRENCY", "16")))
+    parser.add_argument("--limit", type=int, default=None, help="stop after this many results")
+    parser.add_argument("--db", default=os.getenv("MONGODB_DB", "test"))
+    parser.add_argument("--mongomock", action="store_true", help="use an in-memory mongomock database")
+    parser.add_argument("--fake-llm", action="store_true", help="use the offline fake LLM from bench/")
+    parser.add_argument("--seed-results", type=int, default=0, help="insert synthetic results first")
+    parser.add_argument("--retry-failures", action="store_true",
+                        help="reprocess results recorded in regeneration_failures instead of new ones")
+    args = parser.parse_args()
+
+    if args.mongomock:
+        import mongomock
+        client = mongomock.MongoClient()
+    else:
+        from pymongo import MongoClient
+        client = MongoClient(os.getenv("MONGODB_URL"))
+    db = client[args.db]
+    if args.seed_results:
+        seed_results(db, args.seed_results)
+
+    if args.fake_llm:
+        from bench.fake_llm import FakeLatencyChatModel
+        agent = Agent(llm=FakeLatencyChatModel(latency=0.05, per_question=0.005))
+    else:
+        agent = Agent()
+
+    async def run():
+        worker = RegenerationWorker(db, agent, args.question_types, args.number_of_questions,
+                                    args.page_size, args.concurrency)
+        if args.retry_failures:
+            return await worker.retry_failures(args.limit)
+        return await worker.run(args.limit)
+
+    stats = asyncio.run(run())
+    print("done: %(rows)d rows in %(seconds).2fs (%(rows_per_second).1f rows/s), "
+          "%(inserted)d inserted, %(duplicates)d duplicates, %(failed)d failed, %(recovered)d recovered" % stats)
+
+
+if __name__ == "__main__":
+    main()